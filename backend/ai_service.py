@@ -22,6 +22,11 @@ from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.cluster import KMeans
 import numpy as np
 
+try:
+    from .keyword_matcher import KeywordMatcher
+except ImportError:
+    from keyword_matcher import KeywordMatcher
+
 # Try to import transformers for local AI processing
 try:
     from transformers import (
@@ -39,6 +44,20 @@ except ImportError:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+CONTENT_CATEGORIES = {
+    "technology": ["tech", "ai", "artificial intelligence", "software", "hardware", "digital", "innovation", "startup", "app", "platform"],
+    "business": ["business", "finance", "economy", "market", "stock", "investment", "corporate", "company", "revenue", "profit"],
+    "politics": ["politics", "government", "election", "congress", "senate", "president", "minister", "policy", "law", "democracy"],
+    "health": ["health", "medical", "medicine", "healthcare", "disease", "treatment", "vaccine", "wellness", "hospital", "doctor"],
+    "science": ["science", "research", "study", "discovery", "experiment", "climate", "environment", "space", "physics", "chemistry"],
+    "sports": ["sports", "football", "basketball", "soccer", "tennis", "olympics", "championship", "team", "player", "game"],
+    "entertainment": ["entertainment", "movie", "music", "celebrity", "hollywood", "film", "television", "show", "actor", "artist"]
+}
+TRENDING_KEYWORDS = ["breaking", "urgent", "exclusive", "developing", "alert", "first", "new", "major", "shocking", "unprecedented"]
+
+# Compiled once; categorization and trending detection each scan a text a single time
+content_matcher = KeywordMatcher(CONTENT_CATEGORIES, TRENDING_KEYWORDS)
+
 class AdvancedAIService:
     """
     Advanced AI service for comprehensive news processing
@@ -565,34 +584,15 @@ class AdvancedAIService:
         """
         Categorize content based on keywords and patterns
         """
-        categories = {
-            "technology": ["tech", "ai", "artificial intelligence", "software", "hardware", "digital", "innovation", "startup", "app", "platform"],
-            "business": ["business", "finance", "economy", "market", "stock", "investment", "corporate", "company", "revenue", "profit"],
-            "politics": ["politics", "government", "election", "congress", "senate", "president", "minister", "policy", "law", "democracy"],
-            "health": ["health", "medical", "medicine", "healthcare", "disease", "treatment", "vaccine", "wellness", "hospital", "doctor"],
-            "science": ["science", "research", "study", "discovery", "experiment", "climate", "environment", "space", "physics", "chemistry"],
-            "sports": ["sports", "football", "basketball", "soccer", "tennis", "olympics", "championship", "team", "player", "game"],
-            "entertainment": ["entertainment", "movie", "music", "celebrity", "hollywood", "film", "television", "show", "actor", "artist"]
+        match = content_matcher.match(text)
+        category_scores = {
+            category: {
+                "score": sum(hits.values()),
+                "matched_keywords": list(hits)
+            }
+            for category, hits in match.category_hits.items()
         }
         
-        text_lower = text.lower()
-        category_scores = {}
-        
-        for category, keywords in categories.items():
-            score = 0
-            matched_keywords = []
-            
-            for keyword in keywords:
-                if keyword in text_lower:
-                    score += text_lower.count(keyword)
-                    matched_keywords.append(keyword)
-                    
-            if score > 0:
-                category_scores[category] = {
-                    "score": score,
-                    "matched_keywords": matched_keywords
-                }
-                
         if category_scores:
             top_category = max(category_scores, key=lambda x: category_scores[x]["score"])
             confidence = min(category_scores[top_category]["score"] / 10, 1.0)  # Normalize
@@ -619,15 +619,14 @@ class AdvancedAIService:
         text_content = self._extract_text_content(article_data)
         
         # Check for trending keywords
-        trending_keywords = ["breaking", "urgent", "exclusive", "developing", "alert", "first", "new", "major", "shocking", "unprecedented"]
-        title = article_data.get("title", "").lower()
-        description = article_data.get("description", "").lower()
+        title_hits = content_matcher.match(article_data.get("title", "")).trending_hits
+        description_hits = content_matcher.match(article_data.get("description", "")).trending_hits
         
-        for keyword in trending_keywords:
-            if keyword in title:
+        for keyword in TRENDING_KEYWORDS:
+            if keyword in title_hits:
                 trending_score += 3
                 factors.append(f"trending_keyword_in_title: {keyword}")
-            elif keyword in description:
+            elif keyword in description_hits:
                 trending_score += 1
                 factors.append(f"trending_keyword_in_description: {keyword}")
                 
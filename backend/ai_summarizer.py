@@ -6,6 +6,7 @@ import requests
 from bs4 import BeautifulSoup
 import re
 import json
+from outbound import get as outbound_get
 
 class AINewsSummarizer:
     def __init__(self):
@@ -78,8 +79,8 @@ class AINewsSummarizer:
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
             }
-            response = requests.get(url, headers=headers, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
+            _, page = outbound_get(None, url, 'article', headers=headers, timeout=10)
+            soup = BeautifulSoup(page, 'html.parser')
             
             # Remove script and style elements
             for script in soup(["script", "style"]):
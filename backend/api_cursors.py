@@ -0,0 +1,111 @@
+"""
+API Fetch Cursors
+Persisted high-water marks for the API sources (NewsAPI, Guardian, Reddit),
+so a refresh asks only for items newer than the last successful run. They
+share the ingest_cursors table with the RSS cursors, under
+'api:<source>:<scope>' keys.
+"""
+
+import logging
+import os
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Set, Tuple
+from sqlalchemy.orm import Session
+
+try:
+    from .ingest_models import IngestCursor
+except ImportError:
+    from ingest_models import IngestCursor
+
+logger = logging.getLogger(__name__)
+
+# Pages requested per source per refresh once a cursor exists; bounds quota use
+API_CURSOR_MAX_PAGES = int(os.getenv('API_CURSOR_MAX_PAGES', '5'))
+
+
+def cursor_key(source: str, scope: str = "") -> str:
+    return f"api:{source}:{scope}"
+
+
+class ApiCursors:
+    """
+    Cursors for one refresh. Sources read their mark with since() and hand
+    what they fetched to fetched(); the caller reports which of those items
+    were stored (or needed no storing) with covered(). commit() then moves
+    each mark only as far as it is safe to: up to the newest covered item
+    that is older than every item left uncovered, and not at all when the
+    source stopped paging before reaching its previous mark.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._rows: Dict[str, IngestCursor] = {}
+        self._fetched: Dict[str, Dict[str, datetime]] = {}
+        self._complete: Dict[str, bool] = {}
+        self._covered: Set[str] = set()
+
+    def get(self, source: str, scope: str = "") -> IngestCursor:
+        key = cursor_key(source, scope)
+        if key not in self._rows:
+            row = self.db.query(IngestCursor).filter(IngestCursor.cursor_key == key).first()
+            if row is None:
+                row = IngestCursor(cursor_key=key)
+                self.db.add(row)
+                self.db.commit()
+            self._rows[key] = row
+        return self._rows[key]
+
+    def since(self, source: str, scope: str = "") -> Optional[datetime]:
+        """Publication time of the newest item stored by earlier runs, if any"""
+        return self.get(source, scope).last_entry_at
+
+    def fetched(self, source: str, scope: str, entries: Iterable[Tuple[str, Optional[datetime]]],
+                complete: bool):
+        """
+        Record the (entry_id, entry_at) pairs a source fetched this run.
+        `complete` means paging reached the previous mark (or the listing's
+        end), so nothing between the mark and these items was skipped.
+        """
+        self.get(source, scope)
+        key = cursor_key(source, scope)
+        items = self._fetched.setdefault(key, {})
+        for entry_id, entry_at in entries:
+            if entry_id and entry_at is not None:
+                items[entry_id] = entry_at
+        self._complete[key] = self._complete.get(key, True) and complete
+
+    def covered(self, entry_ids: Iterable[str]):
+        """Items that are stored, already were, or were dropped as duplicates"""
+        self._covered.update(entry_id for entry_id in entry_ids if entry_id)
+
+    def _safe_mark(self, key: str) -> Optional[Tuple[str, datetime]]:
+        if not self._complete.get(key):
+            return None
+        items = self._fetched.get(key, {})
+        uncovered = [entry_at for entry_id, entry_at in items.items() if entry_id not in self._covered]
+        cutoff = min(uncovered) if uncovered else None
+        candidates = [(entry_at, entry_id) for entry_id, entry_at in items.items()
+                      if entry_id in self._covered and (cutoff is None or entry_at < cutoff)]
+        if not candidates:
+            return None
+        entry_at, entry_id = max(candidates)
+        return entry_id, entry_at
+
+    def commit(self):
+        for key in self._fetched:
+            mark = self._safe_mark(key)
+            if mark is None:
+                continue
+            entry_id, entry_at = mark
+            row = self._rows[key]
+            if row.last_entry_at is None or entry_at > row.last_entry_at:
+                row.last_entry_id = entry_id
+                row.last_entry_at = entry_at
+        self._fetched.clear()
+        self._complete.clear()
+        self._covered.clear()
+        try:
+            self.db.commit()
+        except Exception as e:
+            logger.error(f"Error saving API cursors: {e}")
+            self.db.rollback()
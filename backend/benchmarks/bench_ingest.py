@@ -0,0 +1,254 @@
+"""
+Ingestion Benchmark
+-------------------
+Drives the ingestion paths against the local replay server and a temporary
+SQLite database, so runs are reproducible and never touch live sites.
+
+Paths:
+    legacy        news_fetcher.fetch_and_store_news (sequential requests)
+    legacy-async  news_fetcher.fetch_and_store_news_concurrent (aiohttp + parse pool)
+    aggregator    ModernNewsAggregator.refresh_news over the RSS source (streamed dedupe, categorize, save)
+
+Each path runs in its own subprocess (the legacy and enhanced models both map
+the `news` table, and a fresh process gives an honest peak RSS). Reported per
+path: articles/sec, p50/p99 per-feed latency, DB write time and peak RSS.
+
+    cd backend
+    python benchmarks/bench_ingest.py --copies 15 --items 40 --latency-ms 60 --jitter-ms 40
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+REPO_ROOT = os.path.dirname(BACKEND_DIR)
+
+PATHS = ('legacy', 'legacy-async', 'aggregator')
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class DbWriteTimer:
+    """
+    Sums time spent in write statements and commits on one engine. Writes
+    flushed inside a commit are only counted once, as part of the commit.
+    """
+
+    def __init__(self, engine, session_class):
+        from sqlalchemy import event
+        self.write_seconds = 0.0
+        self.statements = 0
+        self._in_commit = 0
+        self._commit_started = None
+        event.listen(engine, 'before_cursor_execute', self._before_execute)
+        event.listen(engine, 'after_cursor_execute', self._after_execute)
+        event.listen(session_class, 'before_commit', self._before_commit)
+        event.listen(session_class, 'after_commit', self._after_commit)
+        event.listen(session_class, 'after_rollback', self._after_commit)
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info['bench_started'] = time.perf_counter()
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop('bench_started', None)
+        if started is None or not statement.lstrip().upper().startswith(('INSERT', 'UPDATE', 'DELETE')):
+            return
+        self.statements += 1
+        if not self._in_commit:
+            self.write_seconds += time.perf_counter() - started
+
+    def _before_commit(self, session):
+        self._in_commit += 1
+        self._commit_started = time.perf_counter()
+
+    def _after_commit(self, session):
+        if self._in_commit:
+            self._in_commit -= 1
+            self.write_seconds += time.perf_counter() - self._commit_started
+
+
+def _peak_rss_mb(who=resource.RUSAGE_SELF):
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    peak = resource.getrusage(who).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def run_worker(path, feed_urls, db_path, enrich=False):
+    """Run one ingestion path in this process and return its metrics."""
+    sys.path[:0] = [BACKEND_DIR, REPO_ROOT]
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker, Session
+    from database import Base
+
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    timer = DbWriteTimer(engine, Session)
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    result = {'path': path, 'feeds': len(feed_urls)}
+
+    if path in ('legacy', 'legacy-async'):
+        import news_fetcher
+        from models import News
+        Base.metadata.create_all(engine)
+        started = time.perf_counter()
+        if path == 'legacy':
+            news_fetcher.fetch_and_store_news(db, feed_urls=feed_urls)
+        else:
+            stats = news_fetcher.fetch_and_store_news_concurrent(db, feed_urls=feed_urls)
+            result['client_latencies'] = list(stats['feed_latencies'].values())
+        result['ingest_seconds'] = time.perf_counter() - started
+        if enrich:
+            from image_enrichment import enrich_missing_images
+            enrich_started = time.perf_counter()
+            result['enrichment'] = enrich_missing_images(db, limit=100000)
+            result['enrich_seconds'] = time.perf_counter() - enrich_started
+        result['articles'] = db.query(News).count()
+        if path == 'legacy-async':
+            from feed_parsing import parse_pool
+            pool = parse_pool()
+            if pool is not None:
+                pool.shutdown(wait=True)
+    else:
+        from backend.modern_news_aggregator import ModernNewsAggregator
+        from backend.enhanced_models import NewsArticle
+        Base.metadata.create_all(engine)
+        aggregator = ModernNewsAggregator()
+        aggregator.rss_feeds = feed_urls
+        # RSS only: the API adapters would call the real services
+        aggregator.source_streams = lambda query, category, limit, cursors=None, force_refresh=False, errors=None: [
+            aggregator.stream_rss_feeds(limit, errors)]
+
+        async def ingest():
+            await aggregator.start()
+            try:
+                totals = await aggregator.refresh_news(db, limit=100000)
+                return dict(totals, errors=len(totals["errors"]))
+            finally:
+                await aggregator.close()
+
+        started = time.perf_counter()
+        result['saved'] = asyncio.run(ingest())
+        result['ingest_seconds'] = time.perf_counter() - started
+        result['articles'] = db.query(NewsArticle).count()
+
+    db.close()
+    result['db_write_seconds'] = timer.write_seconds
+    result['db_write_statements'] = timer.statements
+    result['peak_rss_mb'] = _peak_rss_mb()
+    result['peak_rss_children_mb'] = _peak_rss_mb(resource.RUSAGE_CHILDREN)
+    return result
+
+
+def _run_path(path, server, args):
+    """Run `path` in a subprocess against `server`; returns its metrics."""
+    server.reset()
+    with tempfile.TemporaryDirectory(prefix='bench-') as tmp:
+        spec = os.path.join(tmp, 'feeds.json')
+        with open(spec, 'w') as f:
+            json.dump(server.feed_urls(), f)
+        env = dict(os.environ, FEED_PACING_DELAY=str(args.pacing))
+        cmd = [sys.executable, os.path.abspath(__file__), '--worker', path,
+               '--feeds-file', spec, '--db', os.path.join(tmp, 'bench.db')]
+        if args.enrich:
+            cmd.append('--enrich')
+        proc = subprocess.run(cmd, env=env, capture_output=True, text=True, cwd=BACKEND_DIR)
+
+    if proc.returncode != 0:
+        last_line = (proc.stderr.strip().splitlines() or ['unknown error'])[-1]
+        return {'path': path, 'error': last_line}
+
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    feed_requests = [r for r in server.log if r.kind == 'feed']
+    latencies = [r.seconds for r in feed_requests]
+    result['feed_requests'] = len(feed_requests)
+    result['feed_errors'] = sum(1 for r in feed_requests if r.status >= 400)
+    result['article_requests'] = sum(1 for r in server.log if r.kind == 'article')
+    result['bytes_served'] = sum(r.nbytes for r in server.log)
+    result['latency_p50_ms'] = round(percentile(latencies, 50) * 1000, 1) if latencies else None
+    result['latency_p99_ms'] = round(percentile(latencies, 99) * 1000, 1) if latencies else None
+    client = result.pop('client_latencies', None)
+    if client:
+        result['client_latency_p50_ms'] = round(percentile(client, 50) * 1000, 1)
+        result['client_latency_p99_ms'] = round(percentile(client, 99) * 1000, 1)
+    elapsed = result['ingest_seconds']
+    result['articles_per_sec'] = round(result['articles'] / elapsed, 1) if elapsed else None
+    return result
+
+
+def _print_report(results):
+    print(f"{'path':<14}{'articles':>9}{'art/s':>9}{'p50 ms':>9}{'p99 ms':>9}"
+          f"{'db s':>8}{'rss MB':>8}{'ingest s':>10}")
+    for r in results:
+        if 'error' in r:
+            print(f"{r['path']:<14} skipped: {r['error']}")
+            continue
+        print(f"{r['path']:<14}{r['articles']:>9}{r['articles_per_sec']:>9}"
+              f"{r['latency_p50_ms']!s:>9}{r['latency_p99_ms']!s:>9}"
+              f"{r['db_write_seconds']:>8.2f}{r['peak_rss_mb']:>8}{r['ingest_seconds']:>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline ingestion benchmark")
+    parser.add_argument('--paths', default=','.join(PATHS),
+                        help="comma separated subset of: " + ', '.join(PATHS))
+    parser.add_argument('--copies', type=int, default=10, help="simulated sources per recorded feed")
+    parser.add_argument('--items', type=int, default=None, help="entries per feed (default: as recorded)")
+    parser.add_argument('--latency-ms', type=float, default=50)
+    parser.add_argument('--jitter-ms', type=float, default=25)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--article-padding-kb', type=int, default=0)
+    parser.add_argument('--gzip', action='store_true', help="serve gzip-compressed bodies")
+    parser.add_argument('--pacing', type=float, default=0.0,
+                        help="FEED_PACING_DELAY for the sequential path (production default 0.2)")
+    parser.add_argument('--enrich', action='store_true', help="also run deferred og:image enrichment (legacy paths)")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', action='store_true', help="print raw JSON results")
+    # Internal: run one path inside a subprocess
+    parser.add_argument('--worker', choices=PATHS, help=argparse.SUPPRESS)
+    parser.add_argument('--feeds-file', help=argparse.SUPPRESS)
+    parser.add_argument('--db', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        with open(args.feeds_file) as f:
+            feed_urls = json.load(f)
+        result = run_worker(args.worker, feed_urls, args.db, args.enrich)
+        # Worker output is noisy; the metrics are always the last line
+        print(json.dumps(result, default=str))
+        return
+
+    sys.path.insert(0, BENCH_DIR)
+    from replay_server import ReplayServer, ReplayConfig
+
+    config = ReplayConfig(copies=args.copies, items=args.items, latency_ms=args.latency_ms,
+                          jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+                          article_padding_kb=args.article_padding_kb, compress=args.gzip,
+                          seed=args.seed)
+    server = ReplayServer(config).start()
+    print(f"Replay server on {server.base_url} with {len(server.feed_urls())} feeds")
+    try:
+        results = [_run_path(path, server, args) for path in args.paths.split(',') if path]
+    finally:
+        server.stop()
+
+    if args.json:
+        print(json.dumps(results, indent=2, default=str))
+    else:
+        _print_report(results)
+
+
+if __name__ == "__main__":
+    main()
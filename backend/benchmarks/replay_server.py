@@ -0,0 +1,263 @@
+"""
+Feed Replay Server
+------------------
+Local HTTP stand-in for the live news sites. Serves the recorded feed bodies
+and article pages under benchmarks/fixtures with configurable latency, error
+rate and feed size, and logs every request so the benchmark can report
+per-feed latency.
+
+Layout of the served URLs (one block per simulated source copy):
+
+    /c<N>/feeds/<fixture>          recorded feed, links rewritten to /c<N>/
+    /c<N>/articles/<slug>.html     article page picked from the fixtures
+
+Run standalone to poke at it by hand:
+
+    python benchmarks/replay_server.py --port 8900 --copies 5 --latency-ms 80
+"""
+
+import argparse
+import gzip
+import hashlib
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+from email.utils import format_datetime, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+FEEDS_DIR = os.path.join(FIXTURES_DIR, 'feeds')
+ARTICLES_DIR = os.path.join(FIXTURES_DIR, 'articles')
+
+_ENTRY_BLOCK = re.compile(r'(<item>.*?</item>|<entry>.*?</entry>)', re.DOTALL)
+_FEED_PATH = re.compile(r'^/c(\d+)/feeds/([\w.-]+)$')
+_ARTICLE_PATH = re.compile(r'^/c(\d+)/articles/([\w.-]+)\.html$')
+_RFC822_DATE = re.compile(r'(<pubDate>)(.*?)(</pubDate>)')
+_ISO_DATE = re.compile(r'(<(?:updated|published)>)(.*?)(</(?:updated|published)>)')
+
+RequestRecord = namedtuple('RequestRecord', 'path kind status seconds nbytes')
+
+
+class ReplayConfig:
+    """Knobs for the simulated network and content."""
+
+    def __init__(self, copies=1, items=None, latency_ms=0, jitter_ms=0, error_rate=0.0,
+                 article_padding_kb=0, compress=False, seed=1):
+        self.copies = copies
+        self.items = items  # entries per feed; None keeps the recorded count
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.article_padding_kb = article_padding_kb
+        self.compress = compress  # gzip bodies for clients that accept it
+        self.seed = seed
+
+
+def _shift_dates(block, delta):
+    """Move an entry's timestamps back by `delta` so replicas stay newest-first."""
+    block = _RFC822_DATE.sub(
+        lambda m: m.group(1) + format_datetime(parsedate_to_datetime(m.group(2)) - delta) + m.group(3), block)
+    return _ISO_DATE.sub(
+        lambda m: m.group(1) + (datetime.strptime(m.group(2), '%Y-%m-%dT%H:%M:%SZ') - delta)
+        .strftime('%Y-%m-%dT%H:%M:%SZ') + m.group(3), block)
+
+def _scale_entries(body, items):
+    """Repeat (or trim) the feed's entries to `items`, keeping links unique."""
+    blocks = _ENTRY_BLOCK.findall(body)
+    if not blocks or items is None:
+        return body
+    # Replicas are pushed back in time by the span of the recorded entries
+    span = timedelta(days=1)
+    scaled = []
+    for i in range(items):
+        block = blocks[i % len(blocks)]
+        replica = i // len(blocks)
+        if replica:
+            block = (block.replace('.html', f'-r{replica}.html')
+                          .replace('</guid>', f'-r{replica}</guid>')
+                          .replace('</id>', f'-r{replica}</id>'))
+            block = _shift_dates(block, span * replica)
+        scaled.append(block)
+    head = body[:body.index(blocks[0])]
+    tail = body[body.rindex(blocks[-1]) + len(blocks[-1]):]
+    return head + '\n'.join(scaled) + tail
+
+
+class _QuietHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients hang up early on purpose (head-only reads, cancelled fetches)
+        if isinstance(sys.exc_info()[1], (ConnectionError, TimeoutError)):
+            return
+        super().handle_error(request, client_address)
+
+
+class ReplayServer:
+    """
+    Threaded HTTP server over the fixtures. Feed bodies are rendered once at
+    start-up; article pages are rendered on first request and cached.
+    """
+
+    def __init__(self, config=None, host='127.0.0.1', port=0):
+        self.config = config or ReplayConfig()
+        self._random = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self.log = []
+        self.feed_names = sorted(os.listdir(FEEDS_DIR))
+        self._article_templates = [
+            open(os.path.join(ARTICLES_DIR, name), encoding='utf-8').read()
+            for name in sorted(os.listdir(ARTICLES_DIR))
+        ]
+        self._articles = {}
+        self._httpd = _QuietHTTPServer((host, port), self._handler_class())
+        self._thread = None
+        self.base_url = f"http://{host}:{self._httpd.server_address[1]}"
+        self._feeds = self._render_feeds()
+
+    def _render_feeds(self):
+        feeds = {}
+        for name in self.feed_names:
+            raw = open(os.path.join(FEEDS_DIR, name), encoding='utf-8').read()
+            raw = _scale_entries(raw, self.config.items)
+            for copy in range(self.config.copies):
+                body = raw.replace('{{BASE_URL}}', f"{self.base_url}/c{copy}").encode('utf-8')
+                feeds[f"/c{copy}/feeds/{name}"] = body
+        return feeds
+
+    def _render_article(self, path, slug):
+        with self._lock:
+            body = self._articles.get(path)
+        if body is None:
+            index = int(hashlib.sha1(slug.encode()).hexdigest(), 16) % len(self._article_templates)
+            page = self._article_templates[index].replace('{{SLUG}}', slug)
+            if self.config.article_padding_kb:
+                filler = '<p>' + 'x' * 1000 + '</p>\n'
+                page = page.replace('</body>', filler * self.config.article_padding_kb + '</body>')
+            body = page.encode('utf-8')
+            with self._lock:
+                self._articles[path] = body
+        return body
+
+    def feed_urls(self):
+        return [self.base_url + path for path in self._feeds]
+
+    def _delay(self):
+        jitter = self.config.jitter_ms
+        with self._lock:
+            offset = self._random.uniform(-jitter, jitter) if jitter else 0
+            fail = self._random.random() < self.config.error_rate
+        return max(0.0, (self.config.latency_ms + offset) / 1000.0), fail
+
+    def record(self, path, kind, status, seconds, nbytes):
+        with self._lock:
+            self.log.append(RequestRecord(path, kind, status, seconds, nbytes))
+
+    def reset(self):
+        """Clear the request log and replay the same error/jitter sequence."""
+        with self._lock:
+            self.log = []
+            self._random.seed(self.config.seed)
+
+    def _handler_class(self):
+        server = self
+
+        class ReplayHandler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status, body=b'', headers=None):
+                self.send_response(status)
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if self.command != 'HEAD' and body:
+                    self.wfile.write(body)
+
+            def do_GET(self):
+                started = time.perf_counter()
+                path = self.path.split('?', 1)[0]
+                if _FEED_PATH.match(path):
+                    kind, body = 'feed', server._feeds.get(path)
+                    content_type = 'application/xml; charset=utf-8'
+                elif _ARTICLE_PATH.match(path):
+                    kind, body = 'article', server._render_article(path, _ARTICLE_PATH.match(path).group(2))
+                    content_type = 'text/html; charset=utf-8'
+                else:
+                    kind, body, content_type = 'other', None, 'text/plain'
+
+                delay, fail = server._delay()
+                if delay:
+                    time.sleep(delay)
+
+                if body is None:
+                    status, headers, body = 404, {'Content-Type': 'text/plain'}, b'not found'
+                elif fail:
+                    status, headers, body = 503, {'Content-Type': 'text/plain'}, b'unavailable'
+                else:
+                    etag = '"%s"' % hashlib.sha1(body).hexdigest()
+                    if self.headers.get('If-None-Match') == etag:
+                        status, headers, body = 304, {'ETag': etag}, b''
+                    else:
+                        status, headers = 200, {'Content-Type': content_type, 'ETag': etag}
+                        if server.config.compress and 'gzip' in (self.headers.get('Accept-Encoding') or ''):
+                            body = gzip.compress(body, compresslevel=5)
+                            headers['Content-Encoding'] = 'gzip'
+                self._send(status, body, headers)
+                server.record(path, kind, status, time.perf_counter() - started, len(body))
+
+            do_HEAD = do_GET
+
+        return ReplayHandler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self._httpd.server_close()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--copies', type=int, default=1)
+    parser.add_argument('--items', type=int, default=None)
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--jitter-ms', type=float, default=0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--article-padding-kb', type=int, default=0)
+    parser.add_argument('--gzip', action='store_true')
+    args = parser.parse_args()
+
+    config = ReplayConfig(args.copies, args.items, args.latency_ms, args.jitter_ms,
+                          args.error_rate, args.article_padding_kb, args.gzip)
+    server = ReplayServer(config, args.host, args.port)
+    print(f"Serving {len(server.feed_urls())} feeds on {server.base_url}")
+    for url in server.feed_urls():
+        print(f"  {url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
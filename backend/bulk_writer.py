@@ -0,0 +1,59 @@
+"""
+Bulk Writer
+-----------
+Batched write path for ingestion: rows are inserted with one
+INSERT ... ON CONFLICT DO NOTHING statement per batch, so duplicates on a
+unique column are skipped by the database instead of a SELECT per row.
+"""
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+INSERT_BATCH_SIZE = 500
+
+
+def _insert_ignore(table, dialect_name, conflict_column):
+    if dialect_name == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+        return sqlite_insert(table).on_conflict_do_nothing(index_elements=[conflict_column])
+    if dialect_name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+        return pg_insert(table).on_conflict_do_nothing(index_elements=[conflict_column])
+    if dialect_name in ('mysql', 'mariadb'):
+        return insert(table).prefix_with('IGNORE')
+    return None
+
+def insert_ignore_duplicates(db: Session, model, rows, conflict_column='url',
+                             batch_size=INSERT_BATCH_SIZE, commit=True):
+    """
+    Insert `rows` (dicts with identical keys) into `model`'s table, ignoring
+    rows whose `conflict_column` already exists. Returns (inserted, skipped).
+    """
+    # Collapse duplicates inside the batch itself; the first occurrence wins
+    unique_rows = list({row[conflict_column]: row for row in reversed(rows)}.values())[::-1]
+    skipped = len(rows) - len(unique_rows)
+    if not unique_rows:
+        return 0, skipped
+
+    table = model.__table__
+    stmt = _insert_ignore(table, db.get_bind().dialect.name, conflict_column)
+    inserted = 0
+    for start in range(0, len(unique_rows), batch_size):
+        batch = unique_rows[start:start + batch_size]
+        if stmt is not None:
+            result = db.execute(stmt, batch)
+            count = result.rowcount if result.rowcount is not None and result.rowcount >= 0 else len(batch)
+        else:
+            # Dialects without conflict-ignore: drop known keys, then insert the rest
+            column = getattr(model, conflict_column)
+            keys = [row[conflict_column] for row in batch]
+            known = {value for (value,) in db.query(column).filter(column.in_(keys))}
+            fresh = [row for row in batch if row[conflict_column] not in known]
+            if fresh:
+                db.execute(insert(table), fresh)
+            count = len(fresh)
+        inserted += count
+        skipped += len(batch) - count
+        if commit:
+            db.commit()
+    return inserted, skipped
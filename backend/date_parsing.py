@@ -0,0 +1,158 @@
+"""
+Date Parsing
+------------
+Publication-date parsing shared by the feed fetcher and the aggregator.
+Feeds are consistent about their own date format, so the parser remembers
+which format last worked for each source and tries it first; RFC 822 dates
+(the RSS norm) go through a hand-written parser instead of strptime. Every
+result is a naive UTC datetime, or None when nothing matches -- callers
+decide what a missing date means rather than getting "now".
+"""
+
+import email.utils
+import re
+import threading
+from datetime import datetime, timedelta, timezone
+
+_MONTHS = {name: number for number, name in enumerate(
+    ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'), start=1)}
+# Offsets in minutes for the zone names RFC 822 allows
+_ZONES = {
+    'gmt': 0, 'ut': 0, 'utc': 0, 'z': 0,
+    'est': -300, 'edt': -240, 'cst': -360, 'cdt': -300,
+    'mst': -420, 'mdt': -360, 'pst': -480, 'pdt': -420,
+}
+# [Day,] DD Mon YYYY HH:MM[:SS] [zone]
+_RFC822 = re.compile(
+    r'\s*(?:[A-Za-z]{3},?\s+)?(\d{1,2})\s+([A-Za-z]{3})[A-Za-z]*\.?\s+(\d{4}|\d{2})'
+    r'\s+(\d{1,2}):(\d{2})(?::(\d{2}))?(?:\s+([+-]\d{4}|[A-Za-z]{1,3}))?\s*$')
+
+
+def _to_utc(value):
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def parse_rfc822(value):
+    """'Tue, 10 Jun 2025 11:53:00 +0000' and common variants, or None."""
+    match = _RFC822.match(value)
+    if match is None:
+        return None
+    day, month, year, hour, minute, second, zone = match.groups()
+    month = _MONTHS.get(month.lower())
+    if month is None:
+        return None
+    year = int(year)
+    if year < 100:
+        year += 2000 if year < 50 else 1900
+    if zone is None or zone[0] not in '+-':
+        offset = _ZONES.get((zone or 'gmt').lower())
+        if offset is None:
+            return None
+    else:
+        offset = int(zone[1:3]) * 60 + int(zone[3:])
+        if zone[0] == '-':
+            offset = -offset
+    try:
+        parsed = datetime(year, month, int(day), int(hour), int(minute), int(second or 0))
+    except ValueError:
+        return None
+    return parsed - timedelta(minutes=offset) if offset else parsed
+
+def parse_iso8601(value):
+    try:
+        return _to_utc(datetime.fromisoformat(value))
+    except ValueError:
+        return None
+
+def _strptime(fmt):
+    def parse(value):
+        try:
+            return _to_utc(datetime.strptime(value, fmt))
+        except ValueError:
+            return None
+    return parse
+
+def parse_email_date(value):
+    """email.utils' lenient RFC 2822 parser, tried last as the catch-all."""
+    parsed = email.utils.parsedate_tz(value)
+    if not parsed:
+        return None
+    try:
+        moment = datetime(*parsed[:6])
+    except ValueError:
+        return None
+    return moment - timedelta(seconds=parsed[9] or 0)
+
+
+# Tried in this order until a source has a remembered format
+DATE_FORMATS = (
+    ('rfc822', parse_rfc822),
+    ('iso8601', parse_iso8601),
+    ('%Y-%m-%d %H:%M:%S %z', _strptime('%Y-%m-%d %H:%M:%S %z')),
+    ('%d %B %Y %H:%M:%S', _strptime('%d %B %Y %H:%M:%S')),
+    ('%B %d, %Y %H:%M', _strptime('%B %d, %Y %H:%M')),
+    ('%m/%d/%Y %H:%M:%S', _strptime('%m/%d/%Y %H:%M:%S')),
+    ('email', parse_email_date),
+)
+
+
+class DateParser:
+    """
+    Thread-safe date parser that learns each source's format. A source's
+    `fallbacks` count goes up whenever its remembered format stops matching
+    and the full list has to be searched. Callers that need the counts of
+    one batch -- e.g. a feed parsed in a worker process, whose counters
+    never reach the parent -- pass their own `counts` dict to parse().
+    """
+
+    def __init__(self, formats=DATE_FORMATS):
+        self.formats = dict(formats)
+        self._lock = threading.Lock()
+        self._learned = {}
+        self._counters = {}
+
+    def _count(self, source, key, counts=None):
+        if counts is not None:
+            counts[key] = counts.get(key, 0) + 1
+        with self._lock:
+            counters = self._counters.setdefault(source, {'parsed': 0, 'fallbacks': 0, 'failed': 0})
+            counters[key] += 1
+
+    def parse(self, value, source=None, counts=None):
+        """Naive UTC datetime for `value`, or None."""
+        if not value or not isinstance(value, str):
+            return None
+        value = value.strip()
+        learned = self._learned.get(source)
+        if learned is not None:
+            parsed = self.formats[learned](value)
+            if parsed is not None:
+                self._count(source, 'parsed', counts)
+                return parsed
+            self._count(source, 'fallbacks', counts)
+        for name, parse in self.formats.items():
+            if name == learned:
+                continue
+            parsed = parse(value)
+            if parsed is not None:
+                self._learned[source] = name
+                self._count(source, 'parsed', counts)
+                return parsed
+        self._count(source, 'failed', counts)
+        return None
+
+    def stats(self):
+        """{source: {'format', 'parsed', 'fallbacks', 'failed'}}"""
+        with self._lock:
+            return {
+                source: dict(counters, format=self._learned.get(source))
+                for source, counters in self._counters.items()
+            }
+
+
+date_parser = DateParser()
+
+def parse_date(value, source=None, counts=None):
+    """Parse with the process-wide parser; see DateParser.parse."""
+    return date_parser.parse(value, source, counts)
@@ -3,7 +3,7 @@ Enhanced API Routes with AI-Powered Features
 Modern news aggregation, AI summarization, and intelligent categorization
 """
 
-from fastapi import APIRouter, HTTPException, Depends, Query, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Depends, Query
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import desc, func, and_, or_
@@ -14,7 +14,11 @@ import logging
 
 from database import get_db
 from .enhanced_models import NewsArticle, UserInteraction, TrendingTopic, NewsSource
-from modern_news_aggregator import ModernNewsAggregator
+from .ingest_models import FeedHealth
+from .feed_health import health_summary
+from .date_parsing import date_parser
+from .modern_news_aggregator import ModernNewsAggregator
+from .ingestion_runs import IngestionCoordinator, get_run, run_as_dict
 import openai
 
 # Configure logging
@@ -24,8 +28,10 @@ logger = logging.getLogger(__name__)
 # Initialize router
 router = APIRouter(prefix="/api/v2", tags=["Enhanced News API"])
 
-# Initialize news aggregator
+# Initialize news aggregator (its HTTP session is opened and closed by the app lifespan)
 news_aggregator = ModernNewsAggregator(openai_api_key="YOUR_OPENAI_KEY")  # Replace with actual key
+# Every aggregation (API refresh, periodic update, startup fetch) runs through this
+ingestion_coordinator = IngestionCoordinator(news_aggregator)
 
 # Mobile health check endpoint (router version)
 @router.get("/test")
@@ -257,20 +263,30 @@ async def search_news(
 
 @router.post("/news/refresh")
 async def refresh_news(
-    background_tasks: BackgroundTasks,
     category: Optional[str] = None,
-    limit: int = Query(100, ge=10, le=500)
+    limit: int = Query(100, ge=10, le=500),
+    force: bool = Query(False, description="Bypass the API response cache")
 ):
     """
-    Trigger news refresh from all sources
+    Trigger news refresh from all sources. While a refresh with the same
+    parameters is running the request joins it; otherwise it is queued to
+    run next. Poll /news/refresh/{run_id} for progress.
     """
     try:
-        # Add background task to fetch news
-        background_tasks.add_task(fetch_news_background, category, limit)
+        run_id, joined = ingestion_coordinator.trigger("api", category=category, limit=limit,
+                                                       force_refresh=force)
+        if joined:
+            message = "Joined a news refresh already in progress or queued"
+        elif run_id != ingestion_coordinator.current_run_id:
+            message = "News refresh queued behind the one in progress"
+        else:
+            message = "News refresh initiated in background"
         
         return {
             "status": "success",
-            "message": "News refresh initiated in background",
+            "message": message,
+            "run_id": run_id,
+            "coalesced": joined,
             "estimated_completion": "2-5 minutes"
         }
         
@@ -278,28 +294,19 @@ async def refresh_news(
         logger.error(f"Error initiating news refresh: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
-async def fetch_news_background(category: Optional[str] = None, limit: int = 100):
+@router.get("/news/refresh/{run_id}")
+async def get_refresh_run(run_id: str, db: Session = Depends(get_db)):
     """
-    Background task to fetch news
+    Status and outcome of a news refresh run
     """
     try:
-        db = next(get_db())
-        
-        # Fetch articles
-        articles = await news_aggregator.fetch_news_from_all_sources(
-            category=category,
-            limit=limit
-        )
-        
-        # Save to database with AI processing
-        await news_aggregator.save_articles_to_db(articles, db)
-        
-        logger.info(f"Background news refresh completed. Processed {len(articles)} articles.")
-        
+        run = get_run(db, run_id)
     except Exception as e:
-        logger.error(f"Error in background news fetch: {e}")
-    finally:
-        db.close()
+        logger.error(f"Error fetching refresh run {run_id}: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+    if run is None:
+        raise HTTPException(status_code=404, detail="Refresh run not found")
+    return {"status": "success", "data": run_as_dict(run)}
 
 @router.get("/news/analytics")
 async def get_news_analytics(db: Session = Depends(get_db)):
@@ -504,3 +511,29 @@ async def health_check():
             "Personalized recommendations"
         ]
     }
+
+@router.get("/feeds/health")
+async def get_feed_health(
+    circuit_state: Optional[str] = Query(None, description="Filter by circuit state (closed, open, half_open)"),
+    db: Session = Depends(get_db)
+):
+    """
+    Per-feed health ledger: failure counts, circuit state and latency percentiles,
+    plus this process's date-parsing counts per source
+    """
+    try:
+        query = db.query(FeedHealth)
+        if circuit_state:
+            query = query.filter(FeedHealth.circuit_state == circuit_state)
+        feeds = [health_summary(health) for health in query.order_by(FeedHealth.feed_url).all()]
+
+        return {
+            "status": "success",
+            "data": feeds,
+            "count": len(feeds),
+            "date_parsing": date_parser.stats()
+        }
+
+    except Exception as e:
+        logger.error(f"Error fetching feed health: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
@@ -22,9 +22,11 @@ import uuid
 # Import our modules
 from database import engine, get_db, Base
 from .enhanced_models import NewsArticle, UserInteraction, NewsSource, TrendingTopic
-from .enhanced_api_routes import router as enhanced_api_router
-from .modern_news_aggregator import ModernNewsAggregator, fetch_and_update_news
+from .enhanced_api_routes import router as enhanced_api_router, news_aggregator, ingestion_coordinator
+from .ingestion_runs import abandon_unfinished_runs
 from .ai_service import get_ai_service
+from .seen_urls import warm_seen_indexes
+from .feed_scheduler import AdaptiveScheduler, RATE_WINDOW
 
 # Configure logging
 logging.basicConfig(
@@ -36,21 +38,42 @@ logger = logging.getLogger(__name__)
 # Background task for periodic news updates
 background_tasks_running = False
 
+def _recent_publication_times(window=RATE_WINDOW):
+    """Publication times of recently stored articles, for the update scheduler"""
+    db = next(get_db())
+    try:
+        cutoff = datetime.utcnow() - window
+        rows = db.query(NewsArticle.published_at).filter(NewsArticle.published_at >= cutoff).all()
+        return [published_at for (published_at,) in rows]
+    finally:
+        db.close()
+
 async def periodic_news_update():
     """Background task to periodically fetch and update news"""
     global background_tasks_running
     background_tasks_running = True
     
+    # One aggregation run covers every source, so the whole run is scheduled
+    # from the overall arrival rate, between 10 minutes and 2 hours
+    scheduler = AdaptiveScheduler(["aggregator"], min_interval=600, max_interval=7200,
+                                  default_interval=1800)
+    scheduler.mark_polled(["aggregator"])  # lifespan already runs the initial fetch
+    
     logger.info("Starting periodic news update background task")
     
     while background_tasks_running:
         try:
+            await asyncio.sleep(scheduler.seconds_until_next())
+            
             logger.info("Running scheduled news update...")
-            await fetch_and_update_news()
+            await ingestion_coordinator.run("periodic")
             logger.info("Scheduled news update completed")
             
-            # Wait for 30 minutes before next update
-            await asyncio.sleep(1800)
+            if scheduler.needs_learning():
+                arrivals = await asyncio.to_thread(_recent_publication_times)
+                scheduler.learn({"aggregator": arrivals})
+            scheduler.mark_polled(["aggregator"])
+            logger.info(f"Next news update in {scheduler.intervals['aggregator']:.0f}s (before jitter)")
             
         except Exception as e:
             logger.error(f"Error in periodic news update: {e}")
@@ -70,6 +93,25 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Database initialization error: {e}")
     
+    # Close out refresh runs a previous process left unfinished
+    try:
+        db = next(get_db())
+        abandoned = abandon_unfinished_runs(db)
+        db.close()
+        if abandoned:
+            logger.info(f"Marked {abandoned} unfinished refresh runs as abandoned")
+    except Exception as e:
+        logger.error(f"Refresh run ledger initialization error: {e}")
+    
+    # Load the seen-URL index used to dedupe incoming articles
+    try:
+        db = next(get_db())
+        loaded = warm_seen_indexes(db, tables=(NewsArticle.__tablename__,))
+        db.close()
+        logger.info(f"Seen-URL index loaded: {loaded}")
+    except Exception as e:
+        logger.error(f"Seen-URL index initialization error: {e}")
+    
     # Initialize AI service
     try:
         ai_service = get_ai_service()
@@ -85,13 +127,17 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Rate limiter initialization error: {e}")
     
+    # Open the aggregator's shared HTTP session before anything fetches
+    await news_aggregator.start()
+    logger.info("News aggregator HTTP session opened")
+    
     # Start background tasks
-    asyncio.create_task(periodic_news_update())
+    update_task = asyncio.create_task(periodic_news_update())
     
     # Run initial news fetch
     try:
-        asyncio.create_task(fetch_and_update_news())
-        logger.info("Initial news fetch initiated")
+        run_id, _ = ingestion_coordinator.trigger("startup")
+        logger.info(f"Initial news fetch initiated (run {run_id})")
     except Exception as e:
         logger.error(f"Initial news fetch error: {e}")
     
@@ -100,6 +146,10 @@ async def lifespan(app: FastAPI):
     # Shutdown
     global background_tasks_running
     background_tasks_running = False
+    update_task.cancel()
+    # Stop any refresh run before the HTTP session it fetches through goes away
+    await ingestion_coordinator.close()
+    await news_aggregator.close()
     logger.info("Shutting down News Portal API")
 
 # Create FastAPI application
@@ -0,0 +1,240 @@
+"""
+Raw Feed Archive
+----------------
+Optional on-disk record of every feed response the fetcher receives, so
+parsing can be re-run (after parser changes, or to benchmark it) without
+touching the network. Enabled by setting FEED_ARCHIVE_DIR.
+
+Layout:
+    objects/<sha256[:2]>/<sha256>.gz    gzip'd response body, stored once per content
+    index/<YYYY-MM-DD>.jsonl            one line per response: feed_url, status,
+                                        headers, sha256, size, fetched_at
+
+Replay the archive into a fresh database:
+
+    python feed_archive.py replay --db /tmp/backfill.db
+    python feed_archive.py replay --parse-only --workers 8     # parsing throughput only
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+FEED_ARCHIVE_DIR = os.getenv('FEED_ARCHIVE_DIR', '')
+ARCHIVE_COMPRESS_LEVEL = 6
+
+
+class FeedArchive:
+    """
+    Content-addressed store of raw feed bodies plus a per-day JSONL index.
+    """
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self.objects_dir = os.path.join(self.root, 'objects')
+        self.index_dir = os.path.join(self.root, 'index')
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.index_dir, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], f"{digest}.gz")
+
+    def store(self, feed_url, status, headers=None, body=b'', fetched_at=None):
+        """Archive one response; identical bodies share a single object."""
+        fetched_at = fetched_at or datetime.utcnow()
+        digest = None
+        if body:
+            digest = hashlib.sha256(body).hexdigest()
+            path = self.object_path(digest)
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with gzip.open(tmp_path, 'wb', compresslevel=ARCHIVE_COMPRESS_LEVEL) as f:
+                    f.write(body)
+                os.replace(tmp_path, path)
+        record = {
+            'feed_url': feed_url,
+            'status': status,
+            'headers': dict(headers or {}),
+            'sha256': digest,
+            'size': len(body or b''),
+            'fetched_at': fetched_at.isoformat(),
+        }
+        index_path = os.path.join(self.index_dir, f"{fetched_at:%Y-%m-%d}.jsonl")
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        with self._lock, open(index_path, 'a', encoding='utf-8') as f:
+            f.write(line)
+        return record
+
+    def load(self, digest):
+        with gzip.open(self.object_path(digest), 'rb') as f:
+            return f.read()
+
+    def records(self, feed_urls=None, since=None, until=None, status=None):
+        """Index records in fetch order, optionally filtered."""
+        wanted = set(feed_urls) if feed_urls else None
+        since = since.isoformat() if since else None
+        until = until.isoformat() if until else None
+        records = []
+        for name in sorted(os.listdir(self.index_dir)):
+            if not name.endswith('.jsonl'):
+                continue
+            with open(os.path.join(self.index_dir, name), encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    if wanted is not None and record['feed_url'] not in wanted:
+                        continue
+                    if status is not None and record['status'] != status:
+                        continue
+                    if since and record['fetched_at'] < since:
+                        continue
+                    if until and record['fetched_at'] >= until:
+                        continue
+                    records.append(record)
+        records.sort(key=lambda r: r['fetched_at'])
+        return records
+
+
+_archive = None
+
+def get_feed_archive():
+    """The process-wide archive, or None when FEED_ARCHIVE_DIR is unset."""
+    global _archive
+    if _archive is None and FEED_ARCHIVE_DIR:
+        _archive = FeedArchive(FEED_ARCHIVE_DIR)
+    return _archive
+
+def archive_response(feed_url, status, headers=None, body=b''):
+    """Archive a response if archiving is enabled; never raises."""
+    archive = get_feed_archive()
+    if archive is None:
+        return None
+    try:
+        return archive.store(feed_url, status, headers, body)
+    except Exception as e:
+        print(f"Error archiving response from {feed_url}: {e}")
+        return None
+
+
+def _changed_bodies(records):
+    """Drop repeat polls that returned the same body as the previous one."""
+    last_digest = {}
+    for record in records:
+        if record['sha256'] and last_digest.get(record['feed_url']) != record['sha256']:
+            last_digest[record['feed_url']] = record['sha256']
+            yield record
+
+def _parsed_records(archive, records, workers):
+    """Yield (record, ParsedFeed), parsing on a process pool when workers > 0."""
+    from feed_parsing import parse_feed_bytes
+    bodies = (archive.load(record['sha256']) for record in records)
+    # Keyed by feed URL like live polls, so date-format learning and stats match
+    sources = [record['feed_url'] for record in records]
+    if workers > 0:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            yield from zip(records, pool.map(parse_feed_bytes, bodies, sources, chunksize=4))
+    else:
+        yield from zip(records, map(parse_feed_bytes, bodies, sources))
+
+def replay_archive(db, archive, feed_urls=None, since=None, until=None, workers=0, parse_only=False):
+    """
+    Re-run parsing and normalization over archived 200 responses in fetch
+    order. Entries are stored through the fetcher's normal path (cursors,
+    seen-URL index, bulk insert) unless `parse_only` is set.
+    """
+    records = list(_changed_bodies(archive.records(feed_urls, since, until, status=200)))
+    stats = {'responses': len(records), 'entries': 0, 'added': 0, 'duplicates': 0, 'skipped_early': 0}
+    if not records:
+        return stats
+
+    if not parse_only:
+        # Imported lazily: news_fetcher itself imports this module
+        from news_fetcher import _store_feed_entries
+        from feed_state import load_feed_states, record_poll
+        from feed_cursors import load_cursors
+        urls = sorted({record['feed_url'] for record in records})
+        states = load_feed_states(db, urls)
+        cursors = load_cursors(db, urls)
+
+    started = time.perf_counter()
+    for record, parsed in _parsed_records(archive, records, workers):
+        stats['entries'] += len(parsed.entries)
+        if parse_only:
+            continue
+        feed_url = record['feed_url']
+        inserted, skipped, skipped_early, stored = _store_feed_entries(db, parsed, feed_url, cursors[feed_url])
+        if stored:
+            record_poll(db, states[feed_url], 200, record['headers'], record['sha256'], parsed.title)
+        stats['added'] += inserted
+        stats['duplicates'] += skipped
+        stats['skipped_early'] += skipped_early
+    elapsed = time.perf_counter() - started
+    stats['elapsed_seconds'] = round(elapsed, 3)
+    stats['entries_per_sec'] = round(stats['entries'] / elapsed, 1) if elapsed else None
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Raw feed archive tools")
+    parser.add_argument('--archive', default=FEED_ARCHIVE_DIR, help="archive directory (default: $FEED_ARCHIVE_DIR)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    replay = commands.add_parser('replay', help="re-parse archived feeds into a fresh database")
+    replay.add_argument('--db', help="SQLite file to create and fill (required unless --parse-only)")
+    replay.add_argument('--append', action='store_true', help="allow replaying into an existing database file")
+    replay.add_argument('--feed', action='append', dest='feeds', help="only replay this feed URL (repeatable)")
+    replay.add_argument('--since', type=datetime.fromisoformat, help="ISO timestamp, inclusive")
+    replay.add_argument('--until', type=datetime.fromisoformat, help="ISO timestamp, exclusive")
+    replay.add_argument('--workers', type=int, default=int(os.getenv('FEED_PARSE_WORKERS', '0')))
+    replay.add_argument('--parse-only', action='store_true', help="parse and count entries without storing")
+
+    commands.add_parser('stats', help="summarize the archive")
+    args = parser.parse_args()
+
+    if not args.archive:
+        parser.error("no archive directory: pass --archive or set FEED_ARCHIVE_DIR")
+    archive = FeedArchive(args.archive)
+
+    if args.command == 'stats':
+        records = archive.records()
+        objects = sum(len(files) for _, _, files in os.walk(archive.objects_dir))
+        print(f"{len(records)} responses from {len({r['feed_url'] for r in records})} feeds, "
+              f"{objects} distinct bodies, {sum(r['size'] for r in records)} raw bytes")
+        return
+
+    db = None
+    if not args.parse_only:
+        if not args.db:
+            parser.error("--db is required unless --parse-only is set")
+        if os.path.exists(args.db) and not args.append:
+            parser.error(f"{args.db} already exists; pass --append to replay into it")
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+        from database import Base
+        import news_fetcher  # registers the news and ingestion tables
+        engine = create_engine(f"sqlite:///{os.path.abspath(args.db)}")
+        Base.metadata.create_all(engine)
+        db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    try:
+        stats = replay_archive(db, archive, args.feeds, args.since, args.until,
+                               args.workers, args.parse_only)
+    finally:
+        if db is not None:
+            db.close()
+    print(f"Replayed {stats['responses']} responses: {stats['entries']} entries parsed, "
+          f"{stats['added']} new articles, {stats['duplicates']} duplicates, "
+          f"{stats['skipped_early']} skipped by cursors "
+          f"({stats.get('entries_per_sec')} entries/s)")
+
+
+if __name__ == "__main__":
+    main()
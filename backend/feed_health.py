@@ -0,0 +1,148 @@
+"""
+Feed Health Ledger
+------------------
+Per-feed circuit breaker. Every poll outcome is recorded with its status,
+latency and size. After BREAKER_FAILURE_THRESHOLD consecutive failures the
+circuit opens and the feed is skipped until an exponentially growing backoff
+expires. A single probe then decides whether it closes again. Retry-After is
+always honoured.
+"""
+
+import email.utils
+from datetime import datetime, timedelta, timezone
+from sqlalchemy.orm import Session
+
+# Used by the legacy fetcher (flat imports) and the v2 API (package imports);
+# the table must only be registered once per process
+try:
+    from .ingest_models import FeedHealth
+except ImportError:
+    from ingest_models import FeedHealth
+
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_BASE_BACKOFF = 5 * 60
+BREAKER_MAX_BACKOFF = 24 * 3600
+LATENCY_SAMPLE_SIZE = 50
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+
+def load_health(db: Session, feed_urls):
+    """Return {feed_url: FeedHealth}, creating rows for new feeds."""
+    ledger = {h.feed_url: h for h in db.query(FeedHealth).filter(FeedHealth.feed_url.in_(feed_urls))}
+    for feed_url in feed_urls:
+        if feed_url not in ledger:
+            health = FeedHealth(feed_url=feed_url, consecutive_failures=0, total_successes=0,
+                                total_failures=0, total_bytes=0, circuit_state=CLOSED,
+                                latency_samples=[])
+            db.add(health)
+            ledger[feed_url] = health
+    db.commit()
+    return ledger
+
+def parse_retry_after(value, now=None):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return int(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when is None:
+        return None
+    if when.tzinfo is not None:
+        when = when.astimezone(timezone.utc).replace(tzinfo=None)
+    now = now or datetime.utcnow()
+    return max(0, int((when - now).total_seconds()))
+
+def allow_request(health, now=None):
+    """False while the circuit is open; lets one probe through once it expires."""
+    if health is None or health.circuit_state == CLOSED:
+        return True
+    now = now or datetime.utcnow()
+    if health.open_until and now < health.open_until:
+        return False
+    health.circuit_state = HALF_OPEN
+    return True
+
+def _add_latency(health, latency):
+    latency_ms = round(latency * 1000, 1)
+    samples = list(health.latency_samples or [])
+    samples.append(latency_ms)
+    # Reassign so the JSON column is flagged dirty
+    health.latency_samples = samples[-LATENCY_SAMPLE_SIZE:]
+    health.last_latency_ms = latency_ms
+
+def record_success(health, status, latency, nbytes=0, now=None):
+    now = now or datetime.utcnow()
+    _add_latency(health, latency)
+    health.last_status = status
+    health.last_error = None
+    health.last_bytes = nbytes
+    health.total_bytes = (health.total_bytes or 0) + nbytes
+    health.total_successes = (health.total_successes or 0) + 1
+    health.consecutive_failures = 0
+    health.circuit_state = CLOSED
+    health.open_until = None
+    health.last_success_at = now
+
+def record_failure(health, status=None, error=None, latency=None, retry_after=None, now=None):
+    """Count a failure and open the circuit when the threshold or Retry-After demands it."""
+    now = now or datetime.utcnow()
+    if latency is not None:
+        _add_latency(health, latency)
+    health.last_status = status
+    health.last_error = str(error)[:500] if error else None
+    health.total_failures = (health.total_failures or 0) + 1
+    health.consecutive_failures = (health.consecutive_failures or 0) + 1
+    health.last_failure_at = now
+
+    wait = 0
+    if health.consecutive_failures >= BREAKER_FAILURE_THRESHOLD or health.circuit_state == HALF_OPEN:
+        exponent = max(0, health.consecutive_failures - BREAKER_FAILURE_THRESHOLD)
+        wait = min(BREAKER_MAX_BACKOFF, BREAKER_BASE_BACKOFF * (2 ** exponent))
+    if retry_after:
+        wait = max(wait, retry_after)
+    if wait:
+        health.circuit_state = OPEN
+        health.open_until = now + timedelta(seconds=wait)
+
+def percentile(samples, pct):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+def health_summary(health):
+    samples = health.latency_samples or []
+    return {
+        "feed_url": health.feed_url,
+        "circuit_state": health.circuit_state,
+        "open_until": health.open_until.isoformat() if health.open_until else None,
+        "consecutive_failures": health.consecutive_failures,
+        "total_successes": health.total_successes,
+        "total_failures": health.total_failures,
+        "last_status": health.last_status,
+        "last_error": health.last_error,
+        "latency_ms": {
+            "last": health.last_latency_ms,
+            "p50": percentile(samples, 50),
+            "p95": percentile(samples, 95),
+            "p99": percentile(samples, 99),
+        },
+        "last_bytes": health.last_bytes,
+        "total_bytes": health.total_bytes,
+        "last_success_at": health.last_success_at.isoformat() if health.last_success_at else None,
+        "last_failure_at": health.last_failure_at.isoformat() if health.last_failure_at else None,
+    }
+
+def save_health(db: Session):
+    try:
+        db.commit()
+    except Exception as e:
+        print(f"Error saving feed health: {e}")
+        db.rollback()
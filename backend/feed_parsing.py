@@ -0,0 +1,104 @@
+"""
+Feed Parsing Stage
+------------------
+Turns raw feed bytes into lightweight, picklable entry tuples. feedparser is
+pure Python and CPU heavy, so the concurrent fetcher runs parse_feed_bytes in
+a ProcessPoolExecutor and keeps the event loop free for network I/O.
+"""
+
+import atexit
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from urllib.parse import urlparse, urlunparse, parse_qs, urlencode
+import feedparser
+from date_parsing import parse_date
+
+# 0 parses inline in the calling process
+FEED_PARSE_WORKERS = int(os.getenv('FEED_PARSE_WORKERS', str(min(4, os.cpu_count() or 1))))
+
+NormalizedEntry = namedtuple(
+    'NormalizedEntry',
+    'entry_id title url excerpt image_candidates published_at published_raw',
+)
+# date_stats: the date parser's {'parsed', 'fallbacks', 'failed'} counts for this body
+ParsedFeed = namedtuple('ParsedFeed', 'title entries date_stats', defaults=(None,))
+
+
+def normalize_url(url):
+    if not url:
+        return url
+    url = url.strip().lower()
+    if url.endswith('/'):
+        url = url[:-1]
+    parsed = urlparse(url)
+    qs = parse_qs(parsed.query)
+    filtered_qs = {k: v for k, v in qs.items() if not k.startswith('utm_')}
+    new_query = urlencode(filtered_qs, doseq=True)
+    normalized = urlunparse((parsed.scheme, parsed.netloc, parsed.path, parsed.params, new_query, parsed.fragment))
+    return normalized
+
+def _image_candidates(entry):
+    """Images shipped with the entry itself, best first."""
+    candidates = []
+    for key in ('media_content', 'media_thumbnail'):
+        for media in entry.get(key) or []:
+            if media.get('url'):
+                candidates.append(media['url'])
+    for link in entry.get('links') or []:
+        if link.get('rel') == 'enclosure' and (link.get('type') or '').startswith('image/') and link.get('href'):
+            candidates.append(link['href'])
+    return tuple(candidates)
+
+def _published_at(entry, source=None, date_counts=None):
+    """UTC publication time as a naive datetime, or None."""
+    parsed = entry.get('published_parsed') or entry.get('updated_parsed')
+    if parsed:
+        return datetime(*parsed[:6])
+    return parse_date(entry.get('published', ''), source, date_counts)
+
+def normalize_entry(entry, source=None, date_counts=None):
+    url = normalize_url(entry.get('link', ''))
+    return NormalizedEntry(
+        entry_id=entry.get('id') or entry.get('link') or '',
+        title=entry.get('title', ''),
+        url=url,
+        excerpt=entry.get('summary', ''),
+        image_candidates=_image_candidates(entry),
+        published_at=_published_at(entry, source, date_counts),
+        published_raw=entry.get('published', ''),
+    )
+
+def parse_feed_bytes(body, source=None):
+    """
+    Parse a raw feed body into a ParsedFeed of NormalizedEntry tuples.
+    `source` (usually the feed URL) keys the date parser's format memory.
+    The date counts travel back with the entries because a pool worker's
+    own parser counters are never seen by the parent.
+    """
+    d = feedparser.parse(body)
+    date_counts = {'parsed': 0, 'fallbacks': 0, 'failed': 0}
+    return ParsedFeed(
+        title=d.feed.get('title', ''),
+        entries=[normalize_entry(entry, source, date_counts) for entry in d.entries],
+        date_stats=date_counts,
+    )
+
+
+_pool = None
+
+def parse_pool():
+    """Process pool shared by all fetch cycles, or None when parsing inline."""
+    global _pool
+    if _pool is None and FEED_PARSE_WORKERS > 0:
+        _pool = ProcessPoolExecutor(max_workers=FEED_PARSE_WORKERS)
+        atexit.register(_pool.shutdown, wait=False)
+    return _pool
+
+async def parse_feed_bytes_async(loop, body, source=None):
+    """Parse on the process pool, falling back to inline parsing."""
+    pool = parse_pool()
+    if pool is None:
+        return parse_feed_bytes(body, source)
+    return await loop.run_in_executor(pool, parse_feed_bytes, body, source)
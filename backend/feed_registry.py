@@ -0,0 +1,78 @@
+"""
+Feed Registry
+-------------
+The RSS feeds polled by both ingestion paths: news_fetcher (legacy app) and
+ModernNewsAggregator.fetch_rss_feeds (enhanced app).
+"""
+
+# All news channels/resources (for future segregation)
+RSS_FEEDS = [
+    # UAE & Middle East
+    'https://www.khaleejtimes.com/rss',
+    'https://gulfnews.com/rss',
+    'https://www.thenationalnews.com/rss',
+    'https://www.arabianbusiness.com/feed',
+    'https://www.aljazeera.com/xml/rss/all.xml',
+    'https://www.arabnews.com/rss.xml',
+    'https://english.aawsat.com/home/rss.xml',
+    'https://www.reuters.com/rssfeed/worldnews',
+    'https://www.reuters.com/rssfeed/businessNews',
+    'https://www.reuters.com/rssfeed/technologyNews',
+    # Global Tech & Finance
+    'https://feeds.feedburner.com/TechCrunch/',
+    'https://www.wired.com/feed/rss',
+    'https://www.theverge.com/rss/index.xml',
+    'https://www.engadget.com/rss.xml',
+    'https://feeds.feedburner.com/venturebeat/SZYF',
+    'https://www.bloomberg.com/feed/podcast/etf-report.xml',
+    'https://feeds.feedburner.com/entrepreneur/latest',
+    # Financial News
+    'https://www.ft.com/rss/home',
+    'https://feeds.feedburner.com/FinancialTimes',
+    'https://www.economist.com/finance-and-economics/rss.xml',
+    'https://www.marketwatch.com/rss/topstories',
+    'https://feeds.feedburner.com/CoinDesk',
+    'https://cointelegraph.com/rss',
+    'https://decrypt.co/feed',
+    # AI & Tech
+    'https://www.artificialintelligence-news.com/feed/',
+    'https://www.techrepublic.com/rssfeeds/articles/',
+    'https://www.zdnet.com/news/rss.xml',
+    'https://www.techradar.com/rss',
+    'https://www.digitaltrends.com/feed/',
+    # Major World News
+    'http://feeds.bbci.co.uk/news/rss.xml',
+    'https://rss.cnn.com/rss/edition.rss',
+    'https://www.npr.org/rss/rss.php?id=1001',
+    'https://www.nytimes.com/services/xml/rss/nyt/HomePage.xml',
+    'https://www.theguardian.com/world/rss',
+    'https://www.hindustantimes.com/feeds/rss/world-news/rssfeed.xml',
+    'https://www.scmp.com/rss/91/feed',
+    # Business & Economy
+    'https://www.forbes.com/business/feed/',
+    'https://www.cnbc.com/id/10001147/device/rss/rss.html',
+    'https://www.businesstimes.com.sg/rss',
+    'https://www.business-standard.com/rss/latest.rss',
+    'https://www.economist.com/business/rss.xml',
+    # Niche/Regional/Other
+    'https://www.finextra.com/rss/news',
+    'https://www.pymnts.com/feed/',
+    'https://www.bankingtech.com/feed/',
+    'https://www.fintechfutures.com/feed/',
+    'https://www.americanbanker.com/feed',
+    'https://www.asiabankingandfinance.net/rss.xml',
+    'https://www.africanews.com/feed/rss',
+    'https://www.japantimes.co.jp/feed/',
+    'https://www.smh.com.au/rss/feed.xml',
+    'https://www.abc.net.au/news/feed/51120/rss.xml',
+    'https://www.moneycontrol.com/rss/markets.xml',
+    'https://www.moneycontrol.com/rss/fintech.xml',
+    'https://www.fintechnews.sg/feed/',
+    'https://www.fintechnews.ch/feed/',
+    'https://www.fintechnews.my/feed/',
+    'https://www.fintechnews.hk/feed/',
+    'https://www.fintechnews.ph/feed/',
+    'https://www.fintechnews.africa/feed/',
+    'https://www.finextra.com/rss/blogs',
+    'https://www.finextra.com/rss/events',
+]
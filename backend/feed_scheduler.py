@@ -0,0 +1,132 @@
+"""
+Adaptive Feed Scheduler
+-----------------------
+Decides when each feed is polled next. Every feed's publishing rate is
+learned from the published_at values already stored for it, so busy feeds
+are polled often and quiet ones rarely, within per-feed min/max bounds and
+with random jitter so polls don't line up.
+"""
+
+import os
+import random
+import time
+from datetime import datetime, timedelta
+from statistics import median
+from sqlalchemy.orm import Session
+
+FEED_MIN_INTERVAL = int(os.getenv('FEED_MIN_INTERVAL', str(5 * 60)))
+FEED_MAX_INTERVAL = int(os.getenv('FEED_MAX_INTERVAL', str(6 * 3600)))
+FEED_DEFAULT_INTERVAL = 3600
+SCHEDULER_JITTER = 0.1
+# How far back stored articles are used to learn publishing rates
+RATE_WINDOW = timedelta(days=7)
+RELEARN_INTERVAL = 15 * 60
+# Never spin faster than this, even when a poll failed and the feed is still due
+SCHEDULER_MIN_SLEEP = 30
+
+# Per-feed (min, max) overrides in seconds
+FEED_INTERVAL_BOUNDS = {
+    'https://www.finextra.com/rss/events': (3 * 3600, 24 * 3600),
+    'https://www.finextra.com/rss/blogs': (3600, 12 * 3600),
+}
+
+
+def inter_arrival_seconds(timestamps):
+    """Median gap between consecutive publications, or None if too few."""
+    times = sorted(t for t in timestamps if t)
+    if len(times) < 2:
+        return None
+    gaps = [(b - a).total_seconds() for a, b in zip(times, times[1:])]
+    gaps = [gap for gap in gaps if gap > 0]
+    return median(gaps) if gaps else None
+
+
+class AdaptiveScheduler:
+    """
+    Tracks a poll interval and next due time per key (usually a feed URL).
+    """
+
+    def __init__(self, keys, min_interval=FEED_MIN_INTERVAL, max_interval=FEED_MAX_INTERVAL,
+                 default_interval=FEED_DEFAULT_INTERVAL, jitter=SCHEDULER_JITTER, bounds=None):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self.bounds = bounds or {}
+        self.intervals = {key: self._clamp(key, default_interval) for key in keys}
+        now = time.monotonic()
+        self.next_due = {key: now for key in keys}  # everything is due on start
+        self._learned_at = None
+
+    def _clamp(self, key, seconds):
+        low, high = self.bounds.get(key, (self.min_interval, self.max_interval))
+        return max(low, min(high, seconds))
+
+    def learn(self, arrivals):
+        """Update intervals from {key: [published_at, ...]}."""
+        for key, timestamps in arrivals.items():
+            if key not in self.intervals:
+                continue
+            gap = inter_arrival_seconds(timestamps)
+            if gap is not None:
+                old_interval = self.intervals[key]
+                self.intervals[key] = self._clamp(key, gap)
+                # Pull a feed forward if it turned out to be busier than assumed
+                if self.intervals[key] < old_interval:
+                    self.next_due[key] = min(self.next_due[key], time.monotonic() + self.intervals[key])
+        self._learned_at = time.monotonic()
+
+    def needs_learning(self):
+        return self._learned_at is None or time.monotonic() - self._learned_at >= RELEARN_INTERVAL
+
+    def due(self, now=None):
+        now = time.monotonic() if now is None else now
+        return [key for key, due_at in self.next_due.items() if due_at <= now]
+
+    def mark_polled(self, keys, now=None):
+        now = time.monotonic() if now is None else now
+        for key in keys:
+            interval = self.intervals[key]
+            spread = interval * self.jitter
+            self.next_due[key] = now + interval + random.uniform(-spread, spread)
+
+    def seconds_until_next(self, now=None):
+        now = time.monotonic() if now is None else now
+        if not self.next_due:
+            return self.max_interval
+        return max(SCHEDULER_MIN_SLEEP, min(self.next_due.values()) - now)
+
+    def polls_per_hour(self):
+        return round(sum(3600 / interval for interval in self.intervals.values()), 1)
+
+
+def feed_arrivals(db: Session, feed_urls, window=RATE_WINDOW):
+    """
+    Stored publication times per feed URL. Feeds are matched to articles
+    through the feed title recorded in feed_state.
+    """
+    # Legacy-app tables, imported here so the enhanced app can still use the scheduler
+    from ingest_models import FeedState
+    from models import News
+
+    sources = {}
+    for state in db.query(FeedState).filter(FeedState.feed_url.in_(feed_urls)):
+        if state.source:
+            sources.setdefault(state.source, []).append(state.feed_url)
+    if not sources:
+        return {}
+
+    cutoff = datetime.utcnow() - window
+    by_source = {}
+    rows = (db.query(News.source, News.published_at)
+            .filter(News.source.in_(list(sources)), News.published_at >= cutoff))
+    for source, published_at in rows:
+        by_source.setdefault(source, []).append(published_at)
+
+    arrivals = {}
+    for source, urls in sources.items():
+        for url in urls:
+            arrivals[url] = by_source.get(source, [])
+    return arrivals
+
+def feed_scheduler(feed_urls):
+    return AdaptiveScheduler(feed_urls, bounds=FEED_INTERVAL_BOUNDS)
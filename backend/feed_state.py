@@ -0,0 +1,62 @@
+"""
+Feed State Store
+----------------
+Conditional GET support for RSS polling. Remembers each feed's ETag,
+Last-Modified and body hash so unchanged feeds are never re-parsed.
+"""
+
+import hashlib
+from datetime import datetime
+from sqlalchemy.orm import Session
+from ingest_models import FeedState
+
+
+def load_feed_states(db: Session, feed_urls):
+    """Return {feed_url: FeedState}, creating rows for feeds seen the first time."""
+    states = {s.feed_url: s for s in db.query(FeedState).filter(FeedState.feed_url.in_(feed_urls))}
+    for feed_url in feed_urls:
+        if feed_url not in states:
+            state = FeedState(feed_url=feed_url)
+            db.add(state)
+            states[feed_url] = state
+    db.commit()
+    return states
+
+def conditional_headers(state):
+    """Request headers that let the server answer 304 Not Modified."""
+    headers = {}
+    if state is not None:
+        if state.etag:
+            headers['If-None-Match'] = state.etag
+        if state.last_modified:
+            headers['If-Modified-Since'] = state.last_modified
+    return headers
+
+def content_hash(body):
+    return hashlib.sha256(body or b'').hexdigest()
+
+def is_unchanged(state, status, body_hash=None):
+    """True when the poll returned nothing new: a 304 or an identical body."""
+    if status == 304:
+        return True
+    return bool(state is not None and body_hash and state.content_hash == body_hash)
+
+def record_poll(db: Session, state, status, headers=None, body_hash=None, source=None):
+    """Persist the outcome of a poll; validators are only replaced on a 200."""
+    now = datetime.utcnow()
+    state.last_status = status
+    state.last_polled_at = now
+    if status == 200:
+        headers = headers or {}
+        state.etag = headers.get('ETag') or state.etag
+        state.last_modified = headers.get('Last-Modified') or state.last_modified
+        if body_hash and body_hash != state.content_hash:
+            state.content_hash = body_hash
+            state.last_changed_at = now
+        if source:
+            state.source = source
+    try:
+        db.commit()
+    except Exception as e:
+        print(f"Error saving feed state for {state.feed_url}: {e}")
+        db.rollback()
@@ -0,0 +1,161 @@
+"""
+Image Enrichment
+----------------
+Background stage that fills in News.image for articles stored without one.
+The ingest loop stores articles immediately with image=NULL; this stage
+resolves their Open Graph image later with a pool of worker threads.
+"""
+
+import atexit
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from sqlalchemy.orm import Session
+from models import News
+from news_fetcher import USER_AGENT
+from og_image import fetch_og_image
+
+IMAGE_TIMEOUT = 5
+IMAGE_ENRICH_WORKERS = int(os.getenv('IMAGE_ENRICH_WORKERS', '8'))
+IMAGE_ENRICH_BATCH = int(os.getenv('IMAGE_ENRICH_BATCH', '200'))
+IMAGE_RESULT_CACHE_SIZE = 5000
+# Pages without og:image are not retried before this many seconds
+IMAGE_NEGATIVE_TTL = 6 * 3600
+
+
+class ImageEnricher:
+    """
+    Resolves og:image for article URLs with a per-URL result cache and a
+    negative cache for pages that have no og:image. The worker threads live
+    as long as the enricher, so their sessions keep connections alive
+    between passes.
+    """
+
+    def __init__(self, max_workers=IMAGE_ENRICH_WORKERS, cache_size=IMAGE_RESULT_CACHE_SIZE,
+                 negative_ttl=IMAGE_NEGATIVE_TTL):
+        self.max_workers = max_workers
+        self.cache_size = cache_size
+        self.negative_ttl = negative_ttl
+        self._results = OrderedDict()  # url -> image, LRU ordered
+        self._missing = {}             # url -> monotonic expiry
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._pool = None
+
+    def _executor(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix='image-enrich')
+                atexit.register(self._pool.shutdown, wait=False)
+            return self._pool
+
+    def _session(self):
+        # requests.Session is not thread-safe, so each worker gets its own
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers['User-Agent'] = USER_AGENT
+            self._local.session = session
+        return session
+
+    def is_known_missing(self, url):
+        with self._lock:
+            expiry = self._missing.get(url)
+            if expiry is None:
+                return False
+            if expiry < time.monotonic():
+                del self._missing[url]
+                return False
+            return True
+
+    def cached(self, url):
+        """Return (hit, image) from the result cache."""
+        with self._lock:
+            if url in self._results:
+                self._results.move_to_end(url)
+                return True, self._results[url]
+        return False, None
+
+    def _remember(self, url, image):
+        with self._lock:
+            if image:
+                self._results[url] = image
+                self._results.move_to_end(url)
+                while len(self._results) > self.cache_size:
+                    self._results.popitem(last=False)
+            else:
+                now = time.monotonic()
+                if len(self._missing) >= self.cache_size:
+                    self._missing = {u: exp for u, exp in self._missing.items() if exp > now}
+                self._missing[url] = now + self.negative_ttl
+
+    def fetch_image(self, url):
+        """Stream the article's <head> and extract its og:image."""
+        image, _ = fetch_og_image(url, session=self._session(), timeout=IMAGE_TIMEOUT)
+        return image
+
+    def resolve(self, url):
+        hit, image = self.cached(url)
+        if hit:
+            return image
+        if self.is_known_missing(url):
+            return None
+        try:
+            image = self.fetch_image(url)
+        except Exception:
+            # Network errors are cached like misses so dead pages aren't hammered
+            image = None
+        self._remember(url, image)
+        return image
+
+    def enrich_pending(self, db: Session, limit=IMAGE_ENRICH_BATCH):
+        """
+        Resolve images for up to `limit` of the newest articles without one.
+        Returns a stats dict.
+        """
+        started = time.monotonic()
+        pending = []
+        # Over-fetch by the negative cache size so known misses can't starve new rows
+        rows = (db.query(News.id, News.url)
+                .filter(News.image.is_(None))
+                .order_by(News.id.desc())
+                .limit(limit + len(self._missing))
+                .all())
+        for news_id, url in rows:
+            if url and not self.is_known_missing(url):
+                pending.append((news_id, url))
+                if len(pending) >= limit:
+                    break
+
+        images = list(self._executor().map(self.resolve, [url for _, url in pending]))
+
+        found = 0
+        for (news_id, _), image in zip(pending, images):
+            if image:
+                db.query(News).filter(News.id == news_id).update({'image': image})
+                found += 1
+        try:
+            db.commit()
+        except Exception as e:
+            print(f"Error saving enriched images: {e}")
+            db.rollback()
+
+        stats = {
+            'checked': len(pending),
+            'found': found,
+            'elapsed_seconds': round(time.monotonic() - started, 2),
+        }
+        if pending:
+            print(f"Image enrichment: {found}/{len(pending)} images found in {stats['elapsed_seconds']}s")
+        return stats
+
+
+# Process-wide enricher so the caches survive between runs
+image_enricher = ImageEnricher()
+
+def enrich_missing_images(db: Session, limit=IMAGE_ENRICH_BATCH):
+    return image_enricher.enrich_pending(db, limit)
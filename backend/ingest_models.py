@@ -0,0 +1,99 @@
+"""
+Ingestion State Models
+Bookkeeping tables for the RSS ingestion pipeline, kept separate from the
+article models so both the legacy and the enhanced app can import them.
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime, Float, JSON
+from sqlalchemy.sql import func
+from database import Base
+
+class FeedState(Base):
+    """
+    Conditional-GET state per feed URL
+    """
+    __tablename__ = 'feed_state'
+
+    id = Column(Integer, primary_key=True, index=True)
+    feed_url = Column(String(1000), nullable=False, unique=True, index=True)
+    source = Column(String(200))  # Feed title from the last parsed body
+
+    # Validators returned by the server on the last 200 response
+    etag = Column(String(500))
+    last_modified = Column(String(100))
+    content_hash = Column(String(64))  # sha256 of the last parsed body
+
+    # Poll bookkeeping
+    last_status = Column(Integer)
+    last_polled_at = Column(DateTime)
+    last_changed_at = Column(DateTime)
+
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+class IngestCursor(Base):
+    """
+    Newest item already ingested from a source (a feed URL or an API source)
+    """
+    __tablename__ = 'ingest_cursors'
+
+    id = Column(Integer, primary_key=True, index=True)
+    cursor_key = Column(String(1000), nullable=False, unique=True, index=True)
+    last_entry_id = Column(String(1000))  # Entry guid/link or API item id
+    last_entry_at = Column(DateTime)      # Publication time of that entry
+
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+class FeedHealth(Base):
+    """
+    Health ledger and circuit-breaker state per feed URL
+    """
+    __tablename__ = 'feed_health'
+
+    id = Column(Integer, primary_key=True, index=True)
+    feed_url = Column(String(1000), nullable=False, unique=True, index=True)
+
+    # Outcome counters
+    consecutive_failures = Column(Integer, default=0)
+    total_successes = Column(Integer, default=0)
+    total_failures = Column(Integer, default=0)
+    last_status = Column(Integer)
+    last_error = Column(String(500))
+
+    # Transfer metrics
+    latency_samples = Column(JSON)  # Most recent latencies in ms
+    last_latency_ms = Column(Float)
+    last_bytes = Column(Integer)
+    total_bytes = Column(Integer, default=0)
+
+    # Circuit breaker: closed, open or half_open
+    circuit_state = Column(String(20), default='closed')
+    open_until = Column(DateTime)
+
+    last_success_at = Column(DateTime)
+    last_failure_at = Column(DateTime)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+class IngestRun(Base):
+    """
+    Ledger of aggregation runs; concurrent refresh requests join the
+    in-flight run, or a follow-up queued behind it, instead of starting
+    their own
+    """
+    __tablename__ = 'ingest_runs'
+
+    id = Column(Integer, primary_key=True, index=True)
+    run_id = Column(String(36), nullable=False, unique=True, index=True)
+    trigger = Column(String(50))      # api, periodic or startup
+    status = Column(String(20), default='running')  # queued, running, succeeded, failed or abandoned
+    requests = Column(Integer, default=1)  # Triggers coalesced into this run
+    params = Column(JSON)
+
+    # Outcome
+    articles = Column(Integer, default=0)
+    inserted = Column(Integer, default=0)
+    skipped = Column(Integer, default=0)
+    error = Column(String(1000))  # Run failure, or the source errors it survived
+
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
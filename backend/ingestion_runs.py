@@ -0,0 +1,230 @@
+"""
+Ingestion Run Coordinator
+Single-flight guard around ModernNewsAggregator.refresh_news: API refresh
+requests, the periodic update loop and the startup fetch all go through
+trigger()/run(). While a run is in flight, triggers with the same
+parameters join it; any others are merged into a single follow-up run that
+starts when it finishes, so there is never a second aggregation against the
+same database. Every run is recorded in the ingest_runs ledger so clients
+can poll it by run id.
+"""
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+from sqlalchemy.orm import Session
+from database import get_db
+
+try:
+    from .ingest_models import IngestRun
+except ImportError:
+    from ingest_models import IngestRun
+
+logger = logging.getLogger(__name__)
+
+QUEUED, RUNNING, SUCCEEDED, FAILED, ABANDONED = 'queued', 'running', 'succeeded', 'failed', 'abandoned'
+
+
+def run_as_dict(run: IngestRun) -> Dict[str, Any]:
+    return {
+        "run_id": run.run_id,
+        "trigger": run.trigger,
+        "status": run.status,
+        "requests": run.requests,
+        "params": run.params,
+        "articles": run.articles,
+        "inserted": run.inserted,
+        "skipped": run.skipped,
+        "error": run.error,
+        "started_at": run.started_at.isoformat() if run.started_at else None,
+        "finished_at": run.finished_at.isoformat() if run.finished_at else None,
+    }
+
+def get_run(db: Session, run_id: str) -> Optional[IngestRun]:
+    return db.query(IngestRun).filter(IngestRun.run_id == run_id).first()
+
+def merge_params(queued: Dict[str, Any], params: Dict[str, Any]) -> Dict[str, Any]:
+    """Parameters for one run that serves both requests"""
+    return {
+        "category": queued["category"] if queued["category"] == params["category"] else None,
+        "limit": max(queued["limit"], params["limit"]),
+        "force_refresh": queued["force_refresh"] or params["force_refresh"],
+    }
+
+def abandon_unfinished_runs(db: Session) -> int:
+    """Mark runs left queued or running by a previous process as abandoned"""
+    count = db.query(IngestRun).filter(IngestRun.status.in_((QUEUED, RUNNING))).update(
+        {IngestRun.status: ABANDONED, IngestRun.finished_at: datetime.utcnow()},
+        synchronize_session=False)
+    db.commit()
+    return count
+
+
+class IngestionCoordinator:
+    """
+    Runs at most one aggregation at a time per process. Ledger rows are
+    written through their own short-lived sessions so they never share a
+    transaction with the run's article writes.
+    """
+
+    def __init__(self, aggregator):
+        self.aggregator = aggregator
+        self._run_id = None
+        self._params = None
+        self._task = None
+        self._queued = None  # follow-up run: {"run_id", "params", "task"}
+
+    @property
+    def current_run_id(self) -> Optional[str]:
+        if self._task is not None and not self._task.done():
+            return self._run_id
+        return None
+
+    def _write(self, apply):
+        db = next(get_db())
+        try:
+            apply(db)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error updating ingestion run ledger: {e}")
+        finally:
+            db.close()
+
+    def _bump(self, run_id: str, params: Optional[Dict[str, Any]] = None):
+        values = {IngestRun.requests: IngestRun.requests + 1}
+        if params is not None:
+            values[IngestRun.params] = params
+
+        def bump(db):
+            db.query(IngestRun).filter(IngestRun.run_id == run_id).update(values, synchronize_session=False)
+        self._write(bump)
+
+    def _add_run(self, run_id: str, trigger: str, status: str, params: Dict[str, Any]):
+        self._write(lambda db: db.add(IngestRun(
+            run_id=run_id, trigger=trigger, status=status, requests=1, params=params,
+            articles=0, inserted=0, skipped=0,
+            started_at=datetime.utcnow() if status == RUNNING else None)))
+
+    def trigger(self, trigger: str = "api", category: Optional[str] = None, limit: int = 100,
+                force_refresh: bool = False) -> Tuple[str, bool]:
+        """
+        Start a run, join the one in flight if it has the same parameters,
+        or else queue (or merge into) the follow-up run. Returns (run_id,
+        joined); joined is False for a newly started or newly queued run.
+        Must be called from the event loop.
+        """
+        params = {"category": category, "limit": limit, "force_refresh": force_refresh}
+        run_id = self.current_run_id
+        if run_id is not None and params == self._params:
+            self._bump(run_id)
+            logger.info(f"Refresh ({trigger}) joined in-flight run {run_id}")
+            return run_id, True
+
+        if self._queued is not None:
+            queued = self._queued
+            queued["params"] = merge_params(queued["params"], params)
+            self._bump(queued["run_id"], queued["params"])
+            logger.info(f"Refresh ({trigger}) merged into queued run {queued['run_id']}")
+            return queued["run_id"], True
+
+        if run_id is not None:
+            queued_id = uuid.uuid4().hex
+            self._add_run(queued_id, trigger, QUEUED, params)
+            self._queued = {"run_id": queued_id, "params": params, "task": None}
+            self._queued["task"] = asyncio.create_task(self._run_queued(self._task))
+            logger.info(f"Queued ingestion run {queued_id} ({trigger}) behind {run_id}")
+            return queued_id, False
+
+        run_id = uuid.uuid4().hex
+        self._add_run(run_id, trigger, RUNNING, params)
+        self._run_id, self._params = run_id, params
+        self._task = asyncio.create_task(self._run(run_id, **params))
+        logger.info(f"Started ingestion run {run_id} ({trigger})")
+        return run_id, False
+
+    def task_for(self, run_id: str) -> Optional[asyncio.Task]:
+        if self._queued is not None and self._queued["run_id"] == run_id:
+            return self._queued["task"]
+        if run_id == self._run_id:
+            return self._task
+        return None
+
+    async def run(self, trigger: str, **kwargs) -> str:
+        """trigger() and wait for the run (started, joined or queued) to finish"""
+        run_id, _ = self.trigger(trigger, **kwargs)
+        task = self.task_for(run_id)
+        if task is not None:
+            await asyncio.shield(task)
+        return run_id
+
+    async def _run_queued(self, previous: asyncio.Task):
+        """Wait for the run in flight, then start the follow-up run"""
+        try:
+            await asyncio.wait([previous])
+        except asyncio.CancelledError:
+            run_id = self._queued["run_id"]
+
+            def abandon(db):
+                db.query(IngestRun).filter(IngestRun.run_id == run_id).update(
+                    {IngestRun.status: ABANDONED, IngestRun.finished_at: datetime.utcnow()},
+                    synchronize_session=False)
+            self._write(abandon)
+            raise
+        queued, self._queued = self._queued, None
+        run_id, params = queued["run_id"], queued["params"]
+        self._run_id, self._params, self._task = run_id, params, queued["task"]
+
+        def start(db):
+            db.query(IngestRun).filter(IngestRun.run_id == run_id).update(
+                {IngestRun.status: RUNNING, IngestRun.started_at: datetime.utcnow()},
+                synchronize_session=False)
+        self._write(start)
+        logger.info(f"Started queued ingestion run {run_id}")
+        await self._run(run_id, **params)
+
+    async def close(self):
+        """Cancel the queued and in-flight runs and wait for them to wind down"""
+        tasks = [task for task in (self._queued and self._queued["task"], self._task)
+                 if task is not None and not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._queued = None
+
+    async def _run(self, run_id: str, category: Optional[str], limit: int, force_refresh: bool):
+        outcome = {"status": FAILED, "error": None}
+        db = next(get_db())
+        try:
+            totals = await self.aggregator.refresh_news(db, category=category, limit=limit,
+                                                        force_refresh=force_refresh)
+            errors = totals.pop("errors", [])
+            # Sources swallow their own failures; a run that got nothing but errors failed
+            outcome.update(totals, status=FAILED if errors and not totals["articles"] else SUCCEEDED)
+            if errors:
+                outcome["error"] = "; ".join(errors)[:1000]
+                logger.warning(f"Ingestion run {run_id}: {len(errors)} source errors: {outcome['error']}")
+            logger.info(f"Ingestion run {run_id} {outcome['status']}: {totals['articles']} articles, "
+                        f"{totals['inserted']} new")
+        except asyncio.CancelledError:
+            outcome["error"] = "cancelled"
+            raise
+        except Exception as e:
+            outcome["error"] = str(e)[:1000]
+            logger.error(f"Ingestion run {run_id} failed: {e}")
+        finally:
+            db.close()
+
+            def finish(ledger_db):
+                run = get_run(ledger_db, run_id)
+                if run is None:
+                    return
+                run.status = outcome["status"]
+                run.error = outcome["error"]
+                run.articles = outcome.get("articles", 0)
+                run.inserted = outcome.get("inserted", 0)
+                run.skipped = outcome.get("skipped", 0)
+                run.finished_at = datetime.utcnow()
+            self._write(finish)
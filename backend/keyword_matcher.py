@@ -0,0 +1,92 @@
+"""
+Compiled Keyword Matcher
+One combined word-boundary regex over every category and trending keyword,
+so classifying a text is a single scan instead of one substring search per
+keyword.
+"""
+
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+# Plural forms count as hits for their keyword ("market" matches "markets")
+_PLURAL_SUFFIX = r'(?:s|es)?'
+
+
+class KeywordMatch:
+    """Keyword hits for one text: per-category counts and trending hits"""
+
+    def __init__(self, category_hits: Dict[str, Counter], trending_hits: Counter):
+        self.category_hits = category_hits
+        self.trending_hits = trending_hits
+
+    def category_scores(self, distinct: bool = False) -> Dict[str, int]:
+        """{category: score} for categories with any hit; `distinct` counts each keyword once"""
+        return {
+            category: len(hits) if distinct else sum(hits.values())
+            for category, hits in self.category_hits.items()
+        }
+
+    def best_category(self, default: str = "general", distinct: bool = False) -> str:
+        scores = self.category_scores(distinct)
+        if not scores:
+            return default
+        # Ties go to the category listed first, as with max() over a dict
+        return max(scores, key=scores.get)
+
+    def matched_keywords(self, category: str) -> List[str]:
+        return list(self.category_hits.get(category, ()))
+
+    @property
+    def is_trending(self) -> bool:
+        return bool(self.trending_hits)
+
+
+class KeywordMatcher:
+    """
+    Built once from {category: [keywords]} and a trending keyword list.
+    Matching is case-insensitive on whole words; multi-word keywords match
+    across any whitespace.
+    """
+
+    def __init__(self, categories: Dict[str, Iterable[str]], trending: Iterable[str] = ()):
+        self.categories = list(categories)
+        self._owners = {}  # normalized keyword -> [(kind, category)]
+        for category, keywords in categories.items():
+            for keyword in keywords:
+                self._add(keyword, ("category", category))
+        for keyword in trending:
+            self._add(keyword, ("trending", None))
+
+        # Longest first so "artificial intelligence" wins over "intelligence"
+        alternatives = sorted(self._owners, key=len, reverse=True)
+        body = '|'.join(r'\s+'.join(map(re.escape, keyword.split())) for keyword in alternatives)
+        self.pattern = re.compile(rf'\b({body}){_PLURAL_SUFFIX}\b', re.IGNORECASE) if body else None
+
+    def _add(self, keyword: str, owner):
+        normalized = ' '.join(keyword.lower().split())
+        if normalized:
+            owners = self._owners.setdefault(normalized, [])
+            if owner not in owners:
+                owners.append(owner)
+
+    def match(self, text: Optional[str]) -> KeywordMatch:
+        found = Counter()
+        if text and self.pattern is not None:
+            found.update(' '.join(m.group(1).lower().split()) for m in self.pattern.finditer(text))
+
+        # Keep category order stable for tie-breaking
+        category_hits = {}
+        for category in self.categories:
+            category_hits[category] = Counter()
+        trending_hits = Counter()
+        for keyword, count in found.items():
+            for kind, category in self._owners.get(keyword, ()):
+                if kind == "category":
+                    category_hits[category][keyword] += count
+                else:
+                    trending_hits[keyword] += count
+        return KeywordMatch({c: hits for c, hits in category_hits.items() if hits}, trending_hits)
+
+    def match_many(self, texts: Iterable[Optional[str]]) -> List[KeywordMatch]:
+        return [self.match(text) for text in texts]
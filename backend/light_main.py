@@ -2,7 +2,10 @@ from fastapi import FastAPI, Depends
 from sqlalchemy.orm import Session
 from database import SessionLocal, engine, Base
 from models import News
-from news_fetcher import fetch_and_store_news
+from news_fetcher import fetch_and_store_news_concurrent, RSS_FEEDS
+from feed_scheduler import feed_scheduler, feed_arrivals
+from image_enrichment import enrich_missing_images
+from seen_urls import warm_seen_indexes
 from typing import List
 from pydantic import BaseModel
 from fastapi.middleware.cors import CORSMiddleware
@@ -11,6 +14,8 @@ import threading
 import time
 import os
 
+IMAGE_ENRICH_INTERVAL = int(os.getenv("IMAGE_ENRICH_INTERVAL", "120"))
+
 app = FastAPI(title="NewsPortal API", description="AI-Powered News Portal API", version="1.0.0")
 app.add_middleware(
     CORSMiddleware,
@@ -30,21 +35,46 @@ def get_db():
         db.close()
 
 def background_news_fetcher():
+    # Load the seen-URL Bloom filter once so polls dedupe from memory
+    db = SessionLocal()
+    try:
+        warm_seen_indexes(db, tables=(News.__tablename__,))
+    finally:
+        db.close()
+    scheduler = feed_scheduler(RSS_FEEDS)
     while True:
         try:
             db = SessionLocal()
-            fetch_and_store_news(db)
+            if scheduler.needs_learning():
+                scheduler.learn(feed_arrivals(db, RSS_FEEDS))
+            due = scheduler.due()
+            if due:
+                fetch_and_store_news_concurrent(db, feed_urls=due)
+                scheduler.mark_polled(due)
+                print(f"Background news fetch completed: {len(due)} feeds polled, "
+                      f"~{scheduler.polls_per_hour()} polls/hour scheduled")
             db.close()
-            print("Background news fetch completed")
         except Exception as e:
             print(f"Background news fetch error: {e}")
-        time.sleep(3600)
+        time.sleep(scheduler.seconds_until_next())
+
+def background_image_enricher():
+    while True:
+        try:
+            db = SessionLocal()
+            enrich_missing_images(db)
+            db.close()
+        except Exception as e:
+            print(f"Background image enrichment error: {e}")
+        time.sleep(IMAGE_ENRICH_INTERVAL)
 
 @app.on_event("startup")
 async def startup_event():
     thread = threading.Thread(target=background_news_fetcher, daemon=True)
     thread.start()
     print("Background news fetcher started")
+    threading.Thread(target=background_image_enricher, daemon=True).start()
+    print("Background image enricher started")
 
 class NewsOut(BaseModel):
     title: str
@@ -11,10 +11,14 @@ try:
     from sqlalchemy.orm import Session
     from database import SessionLocal, engine, Base
     from models import News
-    from news_fetcher import fetch_and_store_news
+    from news_fetcher import fetch_and_store_news, fetch_and_store_news_concurrent, RSS_FEEDS
+    from feed_scheduler import feed_scheduler, feed_arrivals
+    from image_enrichment import enrich_missing_images
+    from seen_urls import warm_seen_indexes
     from sqlalchemy import text
     import threading
     import time
+    IMAGE_ENRICH_INTERVAL = int(os.getenv("IMAGE_ENRICH_INTERVAL", "120"))
     DATABASE_AVAILABLE = True
     Base.metadata.create_all(bind=engine)
 except ImportError:
@@ -116,15 +120,38 @@ if DATABASE_AVAILABLE:
             db.close()
 
     def background_news_fetcher():
+        # Load the seen-URL Bloom filter once so polls dedupe from memory
+        db = SessionLocal()
+        try:
+            warm_seen_indexes(db, tables=(News.__tablename__,))
+        finally:
+            db.close()
+        scheduler = feed_scheduler(RSS_FEEDS)
         while True:
             try:
                 db = SessionLocal()
-                fetch_and_store_news(db)
+                if scheduler.needs_learning():
+                    scheduler.learn(feed_arrivals(db, RSS_FEEDS))
+                due = scheduler.due()
+                if due:
+                    fetch_and_store_news_concurrent(db, feed_urls=due)
+                    scheduler.mark_polled(due)
+                    print(f"Background news fetch completed: {len(due)} feeds polled, "
+                          f"~{scheduler.polls_per_hour()} polls/hour scheduled")
                 db.close()
-                print("Background news fetch completed")
             except Exception as e:
                 print(f"Background news fetch error: {e}")
-            time.sleep(3600)
+            time.sleep(scheduler.seconds_until_next())
+
+    def background_image_enricher():
+        while True:
+            try:
+                db = SessionLocal()
+                enrich_missing_images(db)
+                db.close()
+            except Exception as e:
+                print(f"Background image enrichment error: {e}")
+            time.sleep(IMAGE_ENRICH_INTERVAL)
 else:
     # Mock database dependency for when database is not available
     def get_db():
@@ -138,6 +165,8 @@ async def startup_event():
         thread = threading.Thread(target=background_news_fetcher, daemon=True)
         thread.start()
         print("Background news fetcher started")
+        threading.Thread(target=background_image_enricher, daemon=True).start()
+        print("Background image enricher started")
     print("📱 NewsPortal API started successfully")
 
 class NewsOut(BaseModel):
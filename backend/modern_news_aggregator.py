@@ -5,19 +5,27 @@ Supports multiple news sources and AI-powered summarization
 
 import asyncio
 import aiohttp
-import hashlib
 import json
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+import os
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Any
 from urllib.parse import urlparse
 import re
 
-import requests
-from bs4 import BeautifulSoup
 from sqlalchemy.orm import Session
 from database import get_db
 from .enhanced_models import NewsArticle
+from .bulk_writer import insert_ignore_duplicates
+from .seen_urls import get_seen_index
+from .outbound import client_session, iter_response_async, read_response_async
+from .feed_registry import RSS_FEEDS
+from .near_duplicates import NearDuplicateIndex, dedupe_articles
+from .keyword_matcher import KeywordMatcher, KeywordMatch
+from .rss_stream import FeedStreamParser, iter_feed_items
+from .date_parsing import parse_date
+from .api_cursors import API_CURSOR_MAX_PAGES, ApiCursors
+from .response_cache import get_response_cache
 import openai
 from transformers import pipeline
 import nltk
@@ -27,6 +35,25 @@ from nltk.sentiment import SentimentIntensityAnalyzer
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Connection pool shared by every source adapter
+AGGREGATOR_MAX_CONNECTIONS = int(os.getenv('AGGREGATOR_MAX_CONNECTIONS', '32'))
+AGGREGATOR_PER_HOST_CONNECTIONS = int(os.getenv('AGGREGATOR_PER_HOST_CONNECTIONS', '4'))
+AGGREGATOR_DNS_CACHE_TTL = int(os.getenv('AGGREGATOR_DNS_CACHE_TTL', '600'))
+AGGREGATOR_REQUEST_TIMEOUT = 30
+
+# RSS fan-out: feeds fetched at once, and the time budget for each one
+RSS_FEED_CONCURRENCY = int(os.getenv('RSS_FEED_CONCURRENCY', '16'))
+RSS_FEED_TIMEOUT = float(os.getenv('RSS_FEED_TIMEOUT', '10'))
+
+# Streaming refresh: articles are handed on in batches of this size, or
+# after this many seconds, whichever comes first
+STREAM_BATCH_SIZE = int(os.getenv('STREAM_BATCH_SIZE', '25'))
+STREAM_FLUSH_SECONDS = float(os.getenv('STREAM_FLUSH_SECONDS', '2'))
+
+# Saving: summaries generated at once, and articles committed per chunk
+SUMMARY_CONCURRENCY = int(os.getenv('SUMMARY_CONCURRENCY', '4'))
+SAVE_CHUNK_SIZE = int(os.getenv('SAVE_CHUNK_SIZE', '50'))
+
 class ModernNewsAggregator:
     """
     Advanced news aggregator with AI capabilities
@@ -51,6 +78,12 @@ class ModernNewsAggregator:
             logger.warning(f"Could not initialize local summarizer: {e}")
             self.summarizer = None
             
+        # Shared HTTP session, opened by start() (or lazily on first use)
+        self._session: Optional[aiohttp.ClientSession] = None
+        
+        # RSS feeds polled by fetch_rss_feeds (same registry as news_fetcher)
+        self.rss_feeds = list(RSS_FEEDS)
+            
         # News source configurations
         self.news_sources = {
             "newsapi": {
@@ -99,6 +132,145 @@ class ModernNewsAggregator:
             "sports": ["sports", "football", "basketball", "soccer", "tennis", "olympics", "championship", "match"],
             "entertainment": ["entertainment", "movie", "music", "celebrity", "hollywood", "film", "television", "gaming"]
         }
+        self.trending_keywords = ["breaking", "urgent", "exclusive", "developing", "alert"]
+        # One compiled pattern over every keyword; built once, so changes to the
+        # lists above after __init__ need a new KeywordMatcher
+        self.keyword_matcher = KeywordMatcher(self.categories, self.trending_keywords)
+
+    async def start(self):
+        """Open the shared HTTP session; call once from the app lifespan"""
+        self.http_session()
+        
+    async def close(self):
+        """Close the shared HTTP session and its connections"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        
+    def http_session(self) -> aiohttp.ClientSession:
+        """
+        The aiohttp session every source adapter shares, with a pooled,
+        DNS-caching connector. Must be called from a running event loop.
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=AGGREGATOR_MAX_CONNECTIONS,
+                limit_per_host=AGGREGATOR_PER_HOST_CONNECTIONS,
+                ttl_dns_cache=AGGREGATOR_DNS_CACHE_TTL,
+            )
+            self._session = client_session(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=AGGREGATOR_REQUEST_TIMEOUT),
+            )
+        return self._session
+
+    def source_streams(self, query: Optional[str] = None, category: Optional[str] = None,
+                       limit: int = 100, cursors: Optional[ApiCursors] = None,
+                       force_refresh: bool = False, errors: Optional[List[str]] = None) -> List[AsyncIterator[Dict]]:
+        """
+        One async-generator adapter per source, each capped at a quarter of
+        `limit`; with `cursors` the API sources fetch only what is new, and
+        `force_refresh` skips their response cache. Sources append what went
+        wrong to `errors`.
+        """
+        return [
+            self._stream_response(self.fetch_from_newsapi(query, category, limit//4, cursors, force_refresh, errors)),
+            self._stream_response(self.fetch_from_guardian(query, category, limit//4, cursors, force_refresh, errors)),
+            self._stream_response(self.fetch_from_reddit(category or "worldnews", limit//4, cursors, force_refresh,
+                                                         errors)),
+            self.stream_rss_feeds(limit//4, errors)
+        ]
+
+    async def _stream_response(self, fetch) -> AsyncIterator[Dict]:
+        """Adapter for sources that answer with a single page of results"""
+        for article in await fetch:
+            yield article
+
+    async def merge_streams(self, streams: List[AsyncIterator[Dict]],
+                            batch_size: int = STREAM_BATCH_SIZE,
+                            flush_seconds: float = STREAM_FLUSH_SECONDS,
+                            errors: Optional[List[str]] = None) -> AsyncIterator[List[Dict]]:
+        """
+        Run every stream concurrently and yield their articles in arrival
+        order, in batches of `batch_size` or whatever arrived within
+        `flush_seconds` of a batch's first article. A stream that raises is
+        dropped and its error appended to `errors`.
+        """
+        queue = asyncio.Queue()
+        finished = object()
+        
+        async def pump(stream):
+            try:
+                async for article in stream:
+                    queue.put_nowait(article)
+            except Exception as e:
+                logger.warning(f"Error fetching from source: {e}")
+                if errors is not None:
+                    errors.append(f"source stream: {e}")
+            finally:
+                await stream.aclose()
+                queue.put_nowait(finished)
+                
+        loop = asyncio.get_running_loop()
+        tasks = [asyncio.create_task(pump(stream)) for stream in streams]
+        running, batch, deadline = len(tasks), [], None
+        try:
+            while running:
+                timeout = max(deadline - loop.time(), 0) if batch else None
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    yield batch
+                    batch = []
+                    continue
+                if item is finished:
+                    running -= 1
+                    continue
+                if not batch:
+                    deadline = loop.time() + flush_seconds
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def stream_news_from_all_sources(self,
+                                           query: Optional[str] = None,
+                                           category: Optional[str] = None,
+                                           limit: int = 100,
+                                           cursors: Optional[ApiCursors] = None,
+                                           force_refresh: bool = False,
+                                           errors: Optional[List[str]] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Merged stream over all sources: yields deduplicated, categorized
+        batches as soon as sources deliver them, so a slow source only delays
+        its own articles. Duplicates of earlier batches are dropped.
+        """
+        seen = NearDuplicateIndex()
+        emitted = 0
+        batches = self.merge_streams(self.source_streams(query, category, limit, cursors, force_refresh, errors),
+                                     errors=errors)
+        try:
+            async for batch in batches:
+                fresh = seen.filter_new(batch)
+                if cursors:
+                    # Near-duplicates of kept articles need no fetching again
+                    kept = {id(article) for article in fresh}
+                    cursors.covered(article.get("url") for article in batch if id(article) not in kept)
+                fresh = fresh[:limit - emitted]
+                if not fresh:
+                    continue
+                emitted += len(fresh)
+                yield self._categorize_articles(fresh)
+                if emitted >= limit:
+                    break
+        finally:
+            await batches.aclose()
 
     async def fetch_news_from_all_sources(self, 
                                         query: Optional[str] = None,
@@ -109,23 +281,9 @@ class ModernNewsAggregator:
         """
         all_articles = []
         
-        # Fetch from different sources concurrently
-        tasks = [
-            self.fetch_from_newsapi(query, category, limit//4),
-            self.fetch_from_guardian(query, category, limit//4),
-            self.fetch_from_reddit(category or "worldnews", limit//4),
-            self.fetch_rss_feeds(limit//4)
-        ]
-        
         try:
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            for result in results:
-                if isinstance(result, list):
-                    all_articles.extend(result)
-                elif isinstance(result, Exception):
-                    logger.warning(f"Error fetching from source: {result}")
-                    
+            async for batch in self.merge_streams(self.source_streams(query, category, limit)):
+                all_articles.extend(batch)
         except Exception as e:
             logger.error(f"Error in concurrent news fetching: {e}")
             
@@ -135,9 +293,102 @@ class ModernNewsAggregator:
         
         return categorized_articles[:limit]
 
-    async def fetch_from_newsapi(self, query: Optional[str], category: Optional[str], limit: int) -> List[Dict]:
+    async def refresh_news(self, db: Session, query: Optional[str] = None,
+                           category: Optional[str] = None, limit: int = 100,
+                           force_refresh: bool = False) -> Dict[str, Any]:
+        """
+        Fetch and store in one pipeline: each batch from the merged stream is
+        saved while the remaining sources are still being fetched. API
+        cursors advance only past articles that are now in the database, and
+        not at all if a write failed. `force_refresh` bypasses the API
+        response cache. Besides the counts, `errors` lists the source
+        failures the run survived.
+        """
+        totals = {"articles": 0, "inserted": 0, "skipped": 0, "errors": []}
+        write_failed = False
+        started = asyncio.get_running_loop().time()
+        cursors = ApiCursors(db)
+        stream = self.stream_news_from_all_sources(query, category, limit, cursors, force_refresh,
+                                                   totals["errors"])
+        try:
+            async for batch in stream:
+                result = await self.save_articles_to_db(batch, db)
+                if not totals["articles"]:
+                    elapsed = asyncio.get_running_loop().time() - started
+                    logger.info(f"First {len(batch)} articles stored after {elapsed:.1f}s")
+                totals["articles"] += len(batch)
+                totals["inserted"] += result["inserted"]
+                totals["skipped"] += result["skipped"]
+                cursors.covered(result["stored"])
+                write_failed = write_failed or result["failed"] > 0
+        finally:
+            await stream.aclose()
+        if write_failed:
+            logger.warning("Some articles could not be written; API cursors left unchanged")
+        else:
+            cursors.commit()
+        cache = get_response_cache()
+        if cache is not None:
+            stats = cache.stats()
+            logger.info(f"API response cache: {stats['hits']} hits, {stats['misses']} misses, "
+                        f"{stats['entries']} entries ({stats['bytes'] // 1024}KB), "
+                        f"{stats['evictions']} evictions")
+        return totals
+
+    async def _get_json(self, source: str, url: str, params: Dict, headers: Optional[Dict] = None,
+                        force_refresh: bool = False, errors: Optional[List[str]] = None) -> Optional[Dict]:
         """
-        Fetch news from NewsAPI
+        GET an API endpoint; the decoded JSON body, or None on a non-200
+        answer or an error payload (either is appended to `errors`). Good
+        answers are served from the response cache while fresh unless
+        `force_refresh` is set; a forced fetch still refreshes it.
+        """
+        cache = get_response_cache()
+        if cache is not None and not force_refresh:
+            # Cache reads and writes are file I/O; keep them off the event loop
+            body = await asyncio.to_thread(cache.get, source, url, params)
+            if body is not None:
+                return json.loads(body)
+                
+        session = self.http_session()
+        async with session.get(url, params=params, headers=headers) as response:
+            if response.status != 200:
+                logger.warning(f"{url} returned {response.status}")
+                if errors is not None:
+                    errors.append(f"{source}: HTTP {response.status}")
+                return None
+            body = await read_response_async(response, 'api')
+        data = json.loads(body)
+        error = self._api_error(data)
+        if error is not None:
+            logger.warning(f"{url} returned an error: {error}")
+            if errors is not None:
+                errors.append(f"{source}: {error}")
+            return None
+        if cache is not None:
+            await asyncio.to_thread(cache.put, source, url, params, body)
+        return data
+
+    def _api_error(self, data) -> Optional[str]:
+        """The error message of a 200 answer that reports a failure, else None"""
+        if not isinstance(data, dict):
+            return "unexpected response"
+        # NewsAPI puts status at the top level, the Guardian under "response"
+        for payload in (data, data.get("response")):
+            if isinstance(payload, dict) and payload.get("status") == "error":
+                return payload.get("message") or payload.get("code") or "error"
+        if "error" in data:  # Reddit
+            return str(data.get("message") or data["error"])
+        return None
+
+    async def fetch_from_newsapi(self, query: Optional[str], category: Optional[str], limit: int,
+                                 cursors: Optional[ApiCursors] = None, force_refresh: bool = False,
+                                 errors: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Fetch news from NewsAPI. With `cursors`, headlines published before
+        the last run's newest one are dropped and later pages are requested
+        while they still hold new headlines (top-headlines has no `from`
+        filter, so the cut is made here).
         """
         articles = []
         api_key = "YOUR_NEWSAPI_KEY"  # Replace with actual API key
@@ -145,34 +396,58 @@ class ModernNewsAggregator:
         if not api_key or api_key == "YOUR_NEWSAPI_KEY":
             return []
             
+        scope = f"{category or 'all'}:{query or ''}"
+        since = cursors.since("newsapi", scope) if cursors else None
+        max_pages = API_CURSOR_MAX_PAGES if since else 1
+        complete = not since
+        
         try:
-            async with aiohttp.ClientSession() as session:
-                # Top headlines
-                url = f"{self.news_sources['newsapi']['base_url']}/top-headlines"
-                params = {
-                    "apiKey": api_key,
-                    "pageSize": limit,
-                    "language": "en"
-                }
+            # Top headlines
+            url = f"{self.news_sources['newsapi']['base_url']}/top-headlines"
+            params = {
+                "apiKey": api_key,
+                "pageSize": min(limit, 100),
+                "language": "en"
+            }
+                
+            if category:
+                params["category"] = category
+            if query:
+                params["q"] = query
                 
-                if category:
-                    params["category"] = category
-                if query:
-                    params["q"] = query
+            for page in range(1, max_pages + 1):
+                data = await self._get_json("newsapi", url, dict(params, page=page), force_refresh=force_refresh,
+                                            errors=errors)
+                if data is None:
+                    break
+                raw = data.get("articles", [])
+                dates = [parse_date(item.get("publishedAt")) for item in raw]
+                newer = [item for item, at in zip(raw, dates) if not since or (at is not None and at > since)]
+                # Undated items count as new; the seen-URL index drops any repeats
+                undated = [item for item, at in zip(raw, dates) if since and at is None]
+                articles.extend(self._process_newsapi_articles(newer + undated))
+                if not newer or len(raw) < params["pageSize"]:
+                    complete = True
+                    break
+                if len(articles) >= limit:
+                    break
                     
-                async with session.get(url, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        articles.extend(self._process_newsapi_articles(data.get("articles", [])))
-                        
         except Exception as e:
             logger.error(f"Error fetching from NewsAPI: {e}")
+            if errors is not None:
+                errors.append(f"newsapi: {e}")
             
-        return articles
+        if cursors:
+            cursors.fetched("newsapi", scope, self._cursor_entries(articles), complete)
+        return articles[:limit]
 
-    async def fetch_from_guardian(self, query: Optional[str], category: Optional[str], limit: int) -> List[Dict]:
+    async def fetch_from_guardian(self, query: Optional[str], category: Optional[str], limit: int,
+                                  cursors: Optional[ApiCursors] = None, force_refresh: bool = False,
+                                  errors: Optional[List[str]] = None) -> List[Dict]:
         """
-        Fetch news from The Guardian API
+        Fetch news from The Guardian API. With `cursors`, only content since
+        the last run's newest item is requested (`from-date`), paging newest
+        first until a known item is reached
         """
         articles = []
         api_key = "YOUR_GUARDIAN_API_KEY"  # Replace with actual API key
@@ -180,81 +455,171 @@ class ModernNewsAggregator:
         if not api_key or api_key == "YOUR_GUARDIAN_API_KEY":
             return []
             
+        scope = f"{category or 'all'}:{query or ''}"
+        since = cursors.since("guardian", scope) if cursors else None
+        max_pages = API_CURSOR_MAX_PAGES if since else 1
+        complete = not since
+        
         try:
-            async with aiohttp.ClientSession() as session:
-                url = f"{self.news_sources['guardian']['base_url']}/search"
-                params = {
-                    "api-key": api_key,
-                    "page-size": limit,
-                    "show-fields": "headline,byline,thumbnail,short-url,bodyText",
-                    "order-by": "newest"
-                }
+            url = f"{self.news_sources['guardian']['base_url']}/search"
+            params = {
+                "api-key": api_key,
+                "page-size": min(limit, 50),
+                "show-fields": "headline,byline,thumbnail,short-url,bodyText",
+                "order-by": "newest"
+            }
+                
+            if query:
+                params["q"] = query
+            if category:
+                params["section"] = category
+            if since:
+                # Day granularity on the API side; the exact cut is made below
+                params["from-date"] = since.date().isoformat()
                 
-                if query:
-                    params["q"] = query
-                if category:
-                    params["section"] = category
+            for page in range(1, max_pages + 1):
+                data = await self._get_json("guardian", url, dict(params, page=page), force_refresh=force_refresh,
+                                            errors=errors)
+                if data is None:
+                    break
+                response = data.get("response", {})
+                results = response.get("results", [])
+                fresh = []
+                reached_known = False
+                for item in results:
+                    if since and (parse_date(item.get("webPublicationDate")) or datetime.max) <= since:
+                        reached_known = True
+                        break
+                    fresh.append(item)
+                articles.extend(self._process_guardian_articles(fresh))
+                if reached_known or page >= response.get("pages", 1):
+                    complete = True
+                    break
+                if len(articles) >= limit:
+                    break
                     
-                async with session.get(url, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        articles.extend(self._process_guardian_articles(data.get("response", {}).get("results", [])))
-                        
         except Exception as e:
             logger.error(f"Error fetching from Guardian: {e}")
+            if errors is not None:
+                errors.append(f"guardian: {e}")
             
-        return articles
+        if cursors:
+            cursors.fetched("guardian", scope, self._cursor_entries(articles), complete)
+        return articles[:limit]
 
-    async def fetch_from_reddit(self, subreddit: str, limit: int) -> List[Dict]:
+    async def fetch_from_reddit(self, subreddit: str, limit: int,
+                                cursors: Optional[ApiCursors] = None, force_refresh: bool = False,
+                                errors: Optional[List[str]] = None) -> List[Dict]:
         """
-        Fetch news from Reddit
+        Fetch news from Reddit's /hot listing. Once a cursor exists, posts
+        no newer than the last run's newest `created_utc` are dropped and
+        later pages are requested with `after` while they still hold new
+        posts (hot is ranked, not ordered by time, so the cut is made here)
         """
         articles = []
+        since = cursors.since("reddit", subreddit) if cursors else None
+        complete = not since
+        created_at = {}
         
         try:
-            async with aiohttp.ClientSession() as session:
-                url = f"{self.news_sources['reddit']['base_url']}/{subreddit}/hot.json"
-                params = {"limit": limit}
-                headers = {"User-Agent": "NewsPortal/1.0"}
-                
-                async with session.get(url, params=params, headers=headers) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        articles.extend(self._process_reddit_posts(data.get("data", {}).get("children", [])))
+            url = f"{self.news_sources['reddit']['base_url']}/{subreddit}/hot.json"
+            params = {"limit": min(limit, 100)}
+            headers = {"User-Agent": "NewsPortal/1.0"}
+            
+            for _ in range(API_CURSOR_MAX_PAGES if since else 1):
+                data = await self._get_json("reddit", url, params, headers, force_refresh, errors)
+                if data is None:
+                    break
+                listing_data = data.get("data", {})
+                children = listing_data.get("children", [])
+                posts = []
+                for post in children:
+                    post_data = post.get("data", {})
+                    created = datetime.utcfromtimestamp(post_data.get("created_utc", 0))
+                    if since and created <= since:
+                        continue
+                    created_at[post_data.get("url")] = created
+                    posts.append(post)
+                articles.extend(self._process_reddit_posts(posts))
+                if not posts or not listing_data.get("after"):
+                    complete = True
+                    break
+                if len(articles) >= limit:
+                    break
+                params = dict(params, after=listing_data["after"])
                         
         except Exception as e:
             logger.error(f"Error fetching from Reddit: {e}")
+            if errors is not None:
+                errors.append(f"reddit: {e}")
             
-        return articles
+        if cursors:
+            # created_utc rather than published_at, which is in local time
+            entries = [(article["url"], created_at.get(article["url"])) for article in articles]
+            cursors.fetched("reddit", subreddit, entries, complete)
+        return articles[:limit]
 
-    async def fetch_rss_feeds(self, limit: int) -> List[Dict]:
+    def _cursor_entries(self, articles: List[Dict]) -> List[tuple]:
+        """(entry_id, entry_at) pairs of fetched articles, for ApiCursors.fetched"""
+        return [(article["url"], parse_date(article.get("published_at"))) for article in articles]
+
+    async def _fetch_rss_feed(self, feed_url: str, semaphore: asyncio.Semaphore,
+                              errors: Optional[List[str]] = None) -> List[Dict]:
         """
-        Fetch from various RSS feeds
+        Fetch and process one feed, bounded by `semaphore` and
+        RSS_FEED_TIMEOUT; failures are appended to `errors`
         """
-        rss_feeds = [
-            "https://rss.cnn.com/rss/edition.rss",
-            "https://feeds.bbci.co.uk/news/rss.xml",
-            "https://www.reuters.com/rssFeed/topNews",
-            "https://feeds.npr.org/1001/rss.xml"
-        ]
-        
-        articles = []
-        
+        async with semaphore:
+            try:
+                session = self.http_session()
+                timeout = aiohttp.ClientTimeout(total=RSS_FEED_TIMEOUT)
+                async with session.get(feed_url, timeout=timeout) as response:
+                    if response.status != 200:
+                        logger.warning(f"RSS feed {feed_url} returned {response.status}")
+                        if errors is not None:
+                            errors.append(f"rss {feed_url}: HTTP {response.status}")
+                        return []
+                    # Items are parsed as chunks arrive; the body is never held whole
+                    parser = FeedStreamParser()
+                    items = []
+                    async for chunk in iter_response_async(response, 'feed'):
+                        items.extend(parser.feed(chunk))
+                    items.extend(parser.close())
+                return self._process_rss_items(items, feed_url)
+            except asyncio.TimeoutError:
+                logger.warning(f"Timed out fetching RSS from {feed_url}")
+                if errors is not None:
+                    errors.append(f"rss {feed_url}: timed out")
+            except Exception as e:
+                logger.warning(f"Error fetching RSS from {feed_url}: {e}")
+                if errors is not None:
+                    errors.append(f"rss {feed_url}: {e}")
+            return []
+
+    async def stream_rss_feeds(self, limit: int, errors: Optional[List[str]] = None) -> AsyncIterator[Dict]:
+        """
+        Yield RSS articles feed by feed as each fetch completes. Each feed
+        contributes at most its share of `limit`, so fast feeds cannot crowd
+        out the rest.
+        """
+        if not self.rss_feeds or limit <= 0:
+            return
+        semaphore = asyncio.Semaphore(RSS_FEED_CONCURRENCY)
+        per_feed = -(-limit // len(self.rss_feeds))
+        tasks = [asyncio.ensure_future(self._fetch_rss_feed(feed_url, semaphore, errors))
+                 for feed_url in self.rss_feeds]
+        emitted = 0
         try:
-            for feed_url in rss_feeds:
-                try:
-                    async with aiohttp.ClientSession() as session:
-                        async with session.get(feed_url) as response:
-                            if response.status == 200:
-                                content = await response.text()
-                                articles.extend(self._process_rss_feed(content, feed_url)[:limit//len(rss_feeds)])
-                except Exception as e:
-                    logger.warning(f"Error fetching RSS from {feed_url}: {e}")
-                    
-        except Exception as e:
-            logger.error(f"Error in RSS fetching: {e}")
-            
-        return articles
+            for completed in asyncio.as_completed(tasks):
+                for article in (await completed)[:per_feed]:
+                    yield article
+                    emitted += 1
+                    if emitted >= limit:
+                        return
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
     def _process_newsapi_articles(self, articles: List[Dict]) -> List[Dict]:
         """Process NewsAPI articles into standard format"""
@@ -325,69 +690,45 @@ class ModernNewsAggregator:
             
         return processed
 
-    def _process_rss_feed(self, content: str, feed_url: str) -> List[Dict]:
-        """Process RSS feed content"""
-        processed = []
-        
+    def _process_rss_feed(self, content, feed_url: str) -> List[Dict]:
+        """Process a complete RSS/Atom feed body (bytes or str)"""
         try:
-            soup = BeautifulSoup(content, 'xml')
-            items = soup.find_all('item')
-            
-            source_name = urlparse(feed_url).netloc
-            
-            for item in items:
-                title = item.find('title')
-                description = item.find('description')
-                link = item.find('link')
-                pub_date = item.find('pubDate')
-                
-                processed.append({
-                    "title": title.text if title else "",
-                    "description": BeautifulSoup(description.text if description else "", 'html.parser').get_text()[:500],
-                    "content": "",
-                    "url": link.text if link else "",
-                    "image_url": "",
-                    "published_at": pub_date.text if pub_date else "",
-                    "source_name": source_name,
-                    "author": "",
-                    "source_type": "rss"
-                })
-                
+            return self._process_rss_items(iter_feed_items(content), feed_url)
         except Exception as e:
             logger.error(f"Error processing RSS feed: {e}")
-            
-        return processed
+            return []
+
+    def _process_rss_items(self, items, feed_url: str) -> List[Dict]:
+        """Map parsed feed items (see rss_stream.item_fields) to the standard format"""
+        source_name = urlparse(feed_url).netloc
+        return [
+            {
+                "title": item["title"],
+                "description": item["description"],
+                "content": "",
+                "url": item["link"],
+                "image_url": item["image_url"],
+                "published_at": item["published"],
+                "source_name": source_name,
+                "author": item["author"],
+                "source_type": "rss"
+            }
+            for item in items
+        ]
 
     def _remove_duplicates(self, articles: List[Dict]) -> List[Dict]:
-        """Remove duplicate articles based on title similarity"""
-        unique_articles = []
-        seen_titles = set()
-        
-        for article in articles:
-            title = article.get("title", "").lower().strip()
-            
-            # Create a hash of the title for comparison
-            title_hash = hashlib.md5(title.encode()).hexdigest()
-            
-            # Check for similar titles
-            is_duplicate = False
-            for seen_hash in seen_titles:
-                # Simple similarity check - you could use more sophisticated methods
-                if title_hash == seen_hash:
-                    is_duplicate = True
-                    break
-                    
-            if not is_duplicate and title:
-                unique_articles.append(article)
-                seen_titles.add(title_hash)
-                
-        return unique_articles
+        """
+        Collapse near-duplicate articles (syndicated or reworded stories) with
+        MinHash LSH, keeping the best representative of each cluster
+        """
+        return dedupe_articles(articles)
 
     def _categorize_articles(self, articles: List[Dict]) -> List[Dict]:
         """Categorize articles based on content"""
-        for article in articles:
-            category = self._determine_category(article)
-            article["category"] = category
+        matches = self.keyword_matcher.match_many(self._keyword_text(article) for article in articles)
+        for article, match in zip(articles, matches):
+            article["category"] = self._determine_category(article, match)
+            article["trending_keywords"] = list(match.trending_hits)
             
             # Add sentiment analysis
             if self.sentiment_analyzer:
@@ -396,21 +737,14 @@ class ModernNewsAggregator:
                 
         return articles
 
-    def _determine_category(self, article: Dict) -> str:
-        """Determine article category based on keywords"""
-        text = f"{article.get('title', '')} {article.get('description', '')}".lower()
-        
-        category_scores = {}
-        
-        for category, keywords in self.categories.items():
-            score = sum(1 for keyword in keywords if keyword.lower() in text)
-            if score > 0:
-                category_scores[category] = score
-                
-        if category_scores:
-            return max(category_scores, key=category_scores.get)
-        
-        return "general"
+    @staticmethod
+    def _keyword_text(article: Dict) -> str:
+        return f"{article.get('title', '')} {article.get('description', '')}"
+
+    def _determine_category(self, article: Dict, match: Optional[KeywordMatch] = None) -> str:
+        """Determine article category by how many distinct category keywords it mentions"""
+        match = match or self.keyword_matcher.match(self._keyword_text(article))
+        return match.best_category(distinct=True)
 
     def _analyze_sentiment(self, article: Dict) -> Dict[str, float]:
         """Analyze sentiment of article"""
@@ -451,7 +785,9 @@ class ModernNewsAggregator:
                 max_length = min(1024, len(content.split()))
                 truncated_content = " ".join(content.split()[:max_length])
                 
-                summary = self.summarizer(truncated_content, max_length=150, min_length=50, do_sample=False)
+                # The model call blocks; keep it off the event loop
+                summary = await asyncio.get_running_loop().run_in_executor(
+                    None, lambda: self.summarizer(truncated_content, max_length=150, min_length=50, do_sample=False))
                 return summary[0]["summary_text"] if summary else None
             except Exception as e:
                 logger.warning(f"Local summarization failed: {e}")
@@ -487,87 +823,104 @@ class ModernNewsAggregator:
         summary_sentences = sentences[:max_sentences]
         return ". ".join(summary_sentences) + "."
 
-    async def save_articles_to_db(self, articles: List[Dict], db: Session):
-        """Save articles to database"""
-        saved_count = 0
+    async def save_articles_to_db(self, articles: List[Dict], db: Session) -> Dict[str, int]:
+        """
+        Save new articles: stored URLs are filtered out in one query, summaries
+        are generated concurrently (at most SUMMARY_CONCURRENCY at a time), and
+        rows are bulk-inserted and committed every SAVE_CHUNK_SIZE articles, so
+        a failure keeps the chunks already written. Besides the counts, returns
+        the URLs now in the database (`stored`) and how many rows a failed
+        write lost (`failed`).
+        """
+        urls = [article.get("url") for article in articles if article.get("url")]
+        seen_index = get_seen_index(NewsArticle.__tablename__)
         
+        # Drop stored URLs up front so they are not summarized again
+        try:
+            new_urls = set(seen_index.filter_new(db, urls))
+        except Exception as e:
+            logger.error(f"Error checking existing articles: {e}")
+            new_urls = set(urls)
+        stored = set(urls) - new_urls
+            
+        pending = []
         for article_data in articles:
-            try:
-                # Check if article already exists
-                existing = db.query(NewsArticle).filter(
-                    NewsArticle.url == article_data.get("url")
-                ).first()
+            url = article_data.get("url")
+            if url in new_urls:
+                new_urls.discard(url)
+                pending.append(article_data)
                 
-                if existing:
-                    continue
-                    
-                # Generate AI summary
-                ai_summary = await self.generate_ai_summary(article_data)
-                
-                # Create new article
-                article = NewsArticle(
-                    title=article_data.get("title", "")[:500],
-                    description=article_data.get("description", "")[:1000],
-                    content=article_data.get("content", ""),
-                    url=article_data.get("url", ""),
-                    image_url=article_data.get("image_url", ""),
-                    published_at=self._parse_date(article_data.get("published_at")),
-                    source_name=article_data.get("source_name", ""),
-                    author=article_data.get("author", ""),
-                    category=article_data.get("category", "general"),
-                    ai_summary=ai_summary,
-                    sentiment_score=article_data.get("sentiment", {}).get("compound", 0),
-                    is_trending=self._is_trending(article_data)
-                )
+        semaphore = asyncio.Semaphore(SUMMARY_CONCURRENCY)
+        
+        async def summarize(article_data):
+            async with semaphore:
+                return await self.generate_ai_summary(article_data)
                 
-                db.add(article)
-                saved_count += 1
+        # Summaries run ahead of the writes; each chunk waits only for its own
+        tasks = [asyncio.ensure_future(summarize(article_data)) for article_data in pending]
+        inserted, skipped, failed = 0, len(articles) - len(pending), 0
+        try:
+            for start in range(0, len(pending), SAVE_CHUNK_SIZE):
+                chunk = pending[start:start + SAVE_CHUNK_SIZE]
+                summaries = await asyncio.gather(*tasks[start:start + SAVE_CHUNK_SIZE], return_exceptions=True)
                 
-            except Exception as e:
-                logger.error(f"Error saving article: {e}")
-                continue
+                rows = []
+                for article_data, ai_summary in zip(chunk, summaries):
+                    try:
+                        if isinstance(ai_summary, Exception):
+                            raise ai_summary
+                        rows.append(self._article_row(article_data, ai_summary))
+                    except Exception as e:
+                        logger.error(f"Error saving article: {e}")
+                        skipped += 1
+                        
+                try:
+                    written, conflicts = insert_ignore_duplicates(db, NewsArticle, rows)
+                    inserted, skipped = inserted + written, skipped + conflicts
+                    seen_index.add_many(row["url"] for row in rows)
+                    stored.update(row["url"] for row in rows)
+                except Exception as e:
+                    db.rollback()
+                    skipped += len(rows)
+                    failed += len(rows)
+                    logger.error(f"Database commit error: {e}")
+        finally:
+            for task in tasks:
+                task.cancel()
                 
-        try:
-            db.commit()
-            logger.info(f"Saved {saved_count} new articles to database")
-        except Exception as e:
-            db.rollback()
-            logger.error(f"Database commit error: {e}")
+        logger.info(f"Saved {inserted} new articles to database ({skipped} skipped)")
+        return {"inserted": inserted, "skipped": skipped, "failed": failed, "stored": stored}
 
-    def _parse_date(self, date_string: str) -> Optional[datetime]:
-        """Parse various date formats"""
-        if not date_string:
-            return datetime.now()
-            
-        # Handle ISO format
-        try:
-            return datetime.fromisoformat(date_string.replace('Z', '+00:00'))
-        except:
-            pass
-            
-        # Handle other common formats
-        formats = [
-            "%Y-%m-%dT%H:%M:%S",
-            "%Y-%m-%d %H:%M:%S",
-            "%a, %d %b %Y %H:%M:%S %Z",
-            "%a, %d %b %Y %H:%M:%S %z"
-        ]
-        
-        for fmt in formats:
-            try:
-                return datetime.strptime(date_string, fmt)
-            except:
-                continue
-                
-        return datetime.now()
+    def _article_row(self, article_data: Dict, ai_summary: Optional[str]) -> Dict[str, Any]:
+        return {
+            "title": article_data.get("title", "")[:500],
+            "description": article_data.get("description", "")[:1000],
+            "content": article_data.get("content", ""),
+            "url": article_data["url"],
+            "image_url": article_data.get("image_url", ""),
+            "published_at": self._parse_date(article_data.get("published_at"), article_data.get("source_name")),
+            "source_name": article_data.get("source_name", ""),
+            "author": article_data.get("author", ""),
+            "category": article_data.get("category", "general"),
+            "ai_summary": ai_summary,
+            "sentiment_score": article_data.get("sentiment", {}).get("compound", 0),
+            "is_trending": self._is_trending(article_data)
+        }
+
+    def _parse_date(self, date_string: str, source: Optional[str] = None) -> Optional[datetime]:
+        """
+        Parse a publication date to naive UTC, trying the format that last
+        worked for `source` first; None when missing or unparseable
+        """
+        return parse_date(date_string, source)
 
     def _is_trending(self, article: Dict) -> bool:
         """Determine if article is trending based on various factors"""
         # Simple trending logic - can be enhanced
-        trending_keywords = ["breaking", "urgent", "exclusive", "developing", "alert"]
-        text = f"{article.get('title', '')} {article.get('description', '')}".lower()
-        
-        has_trending_keywords = any(keyword in text for keyword in trending_keywords)
+        if "trending_keywords" in article:
+            has_trending_keywords = bool(article["trending_keywords"])
+        else:
+            has_trending_keywords = self.keyword_matcher.match(self._keyword_text(article)).is_trending
         
         # Reddit-specific metrics
         if article.get("source_type") == "reddit":
@@ -579,25 +932,26 @@ class ModernNewsAggregator:
 
 
 # Usage example and API endpoint integration
-async def fetch_and_update_news():
+async def fetch_and_update_news(aggregator: Optional[ModernNewsAggregator] = None):
     """Main function to fetch and update news"""
-    aggregator = ModernNewsAggregator(openai_api_key="YOUR_OPENAI_KEY")  # Replace with actual key
+    owns_aggregator = aggregator is None
+    if owns_aggregator:
+        aggregator = ModernNewsAggregator(openai_api_key="YOUR_OPENAI_KEY")  # Replace with actual key
     
     db = next(get_db())
     
     try:
-        # Fetch latest news
-        articles = await aggregator.fetch_news_from_all_sources(limit=200)
-        
-        # Save to database with AI processing
-        await aggregator.save_articles_to_db(articles, db)
+        # Fetch latest news and save it with AI processing as it arrives
+        totals = await aggregator.refresh_news(db, limit=200)
         
-        logger.info(f"News aggregation completed. Processed {len(articles)} articles.")
+        logger.info(f"News aggregation completed. Processed {totals['articles']} articles.")
         
     except Exception as e:
         logger.error(f"Error in news aggregation: {e}")
     finally:
         db.close()
+        if owns_aggregator:
+            await aggregator.close()
 
 
 if __name__ == "__main__":
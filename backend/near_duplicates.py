@@ -0,0 +1,214 @@
+"""
+Near-Duplicate Detection
+Clusters syndicated and lightly reworded stories with MinHash + LSH banding
+over shingled, normalized titles and descriptions, then keeps the best
+representative of each cluster.
+"""
+
+import os
+import re
+from typing import Callable, Dict, List, Optional
+
+# Jaccard similarity of the shingle sets at or above which two articles are duplicates
+NEAR_DUP_THRESHOLD = float(os.getenv('NEAR_DUP_THRESHOLD', '0.6'))
+# Signature length = bands * rows; more rows per band means fewer, closer candidates
+NEAR_DUP_BANDS = 16
+NEAR_DUP_ROWS = 4
+SHINGLE_SIZE = 5
+DESCRIPTION_CHARS = 200
+# Shorter descriptions are too generic to match on
+MIN_DESCRIPTION_CHARS = 40
+
+_NON_WORD = re.compile(r'[^\w\s]+')
+_SPACES = re.compile(r'\s+')
+_HASH_SPACE = 1 << 64
+
+# Rough credibility by source, used to pick a cluster's representative
+SOURCE_TYPE_CREDIBILITY = {
+    "guardian": 0.9,
+    "newsapi": 0.8,
+    "rss": 0.7,
+    "reddit": 0.3,
+}
+MAJOR_SOURCES = ("reuters", "apnews", "associated press", "bbc", "guardian", "nytimes",
+                 "ft.com", "financial times", "bloomberg", "economist", "npr", "cnn")
+
+
+def normalize_text(text: str) -> str:
+    text = _NON_WORD.sub(' ', (text or '').lower())
+    return _SPACES.sub(' ', text).strip()
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set:
+    """Character shingles of already normalized text"""
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+def article_shingles(article: Dict) -> tuple:
+    """(title shingles, description shingles); the latter is empty for short descriptions"""
+    title = normalize_text(article.get("title", ""))
+    description = normalize_text(article.get("description", ""))[:DESCRIPTION_CHARS]
+    if len(description) < MIN_DESCRIPTION_CHARS:
+        description = ""
+    return shingles(title), shingles(description)
+
+def _hash64(shingle: str) -> int:
+    # Signatures never leave the process, so the (salted) builtin hash is enough
+    return hash(shingle) & (_HASH_SPACE - 1)
+
+def minhash_signature(shingle_set: set, num_perm: int) -> tuple:
+    """
+    One-permutation MinHash: each shingle hash lands in one of `num_perm`
+    bins and every bin keeps its minimum, so signing is linear in the number
+    of shingles. Empty bins borrow from the next non-empty bin (rotation
+    densification) so short texts still compare position by position.
+    """
+    bin_width = _HASH_SPACE // num_perm
+    bins = [None] * num_perm
+    for shingle in shingle_set:
+        value = _hash64(shingle)
+        index, offset = divmod(value, bin_width)
+        index = min(index, num_perm - 1)
+        if bins[index] is None or offset < bins[index]:
+            bins[index] = offset
+    if all(b is None for b in bins):
+        return tuple(bins)
+    signature = list(bins)
+    for i in range(num_perm):
+        step = 0
+        while signature[i] is None:
+            step += 1
+            donor = bins[(i + step) % num_perm]
+            if donor is not None:
+                signature[i] = donor + step * bin_width
+    return tuple(signature)
+
+def jaccard(a: set, b: set) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def source_credibility(article: Dict) -> float:
+    source = (article.get("source_name") or "").lower()
+    if any(name in source for name in MAJOR_SOURCES):
+        return 1.0
+    return SOURCE_TYPE_CREDIBILITY.get(article.get("source_type"), 0.5)
+
+def representative_score(article: Dict) -> tuple:
+    """Higher is better: has an image, then source credibility, then richer text"""
+    text_length = len(article.get("content") or "") + len(article.get("description") or "")
+    return (bool(article.get("image_url")), source_credibility(article), min(text_length, 5000))
+
+
+class _DisjointSet:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, a: int, b: int):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            # The earlier article stays the root so cluster order follows input order
+            if root_b < root_a:
+                root_a, root_b = root_b, root_a
+            self.parent[root_b] = root_a
+
+
+def _is_near_duplicate(fields_a: tuple, fields_b: tuple, threshold: float) -> bool:
+    """Titles match, or descriptions match and titles at least half as well"""
+    title_similarity = jaccard(fields_a[0], fields_b[0])
+    if title_similarity >= threshold:
+        return True
+    return title_similarity >= threshold / 2 and jaccard(fields_a[1], fields_b[1]) >= threshold
+
+def _band_keys(fields: tuple, bands: int, rows: int):
+    """LSH bucket keys for (title shingles, description shingles); fields are banded separately"""
+    for field, shingle_set in enumerate(fields):
+        if not shingle_set:
+            continue
+        signature = minhash_signature(shingle_set, bands * rows)
+        for band in range(bands):
+            yield (field, band, signature[band * rows:(band + 1) * rows])
+
+
+def cluster_near_duplicates(articles: List[Dict], threshold: float = NEAR_DUP_THRESHOLD,
+                            bands: int = NEAR_DUP_BANDS, rows: int = NEAR_DUP_ROWS) -> List[List[int]]:
+    """
+    Group article indexes into clusters of near-duplicates. Titles and
+    descriptions are banded separately; articles sharing any bucket are
+    candidates, confirmed by exact Jaccard similarity of their shingles: the
+    titles must match, or the descriptions must match and the titles at
+    least half as well.
+    """
+    shingle_sets = [article_shingles(article) for article in articles]
+    clusters = _DisjointSet(len(articles))
+    buckets = {}
+
+    for index, fields in enumerate(shingle_sets):
+        for key in _band_keys(fields, bands, rows):
+            for other in buckets.get(key, ()):
+                if (clusters.find(other) != clusters.find(index)
+                        and _is_near_duplicate(shingle_sets[other], fields, threshold)):
+                    clusters.union(other, index)
+            buckets.setdefault(key, []).append(index)
+
+    grouped = {}
+    for index in range(len(articles)):
+        grouped.setdefault(clusters.find(index), []).append(index)
+    return [grouped[root] for root in sorted(grouped)]
+
+def dedupe_articles(articles: List[Dict], threshold: float = NEAR_DUP_THRESHOLD,
+                    score: Optional[Callable[[Dict], tuple]] = None) -> List[Dict]:
+    """
+    Keep one article per near-duplicate cluster, chosen by `score` (default
+    representative_score), in the order clusters first appear. Articles
+    without a title are dropped.
+    """
+    score = score or representative_score
+    titled = [article for article in articles if (article.get("title") or "").strip()]
+    unique = []
+    for cluster in cluster_near_duplicates(titled, threshold):
+        # max() keeps the first of equally good candidates
+        unique.append(max((titled[i] for i in cluster), key=score))
+    return unique
+
+
+class NearDuplicateIndex:
+    """
+    Incremental dedupe for article streams. Each batch is first collapsed
+    with dedupe_articles (so the best copy within the batch wins); survivors
+    that near-duplicate an article accepted from an earlier batch are
+    dropped, the rest are indexed and returned.
+    """
+
+    def __init__(self, threshold: float = NEAR_DUP_THRESHOLD,
+                 bands: int = NEAR_DUP_BANDS, rows: int = NEAR_DUP_ROWS):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = rows
+        self._fields = []
+        self._buckets = {}
+
+    def __len__(self):
+        return len(self._fields)
+
+    def filter_new(self, articles: List[Dict], score: Optional[Callable[[Dict], tuple]] = None) -> List[Dict]:
+        fresh = []
+        for article in dedupe_articles(articles, self.threshold, score):
+            fields = article_shingles(article)
+            keys = list(_band_keys(fields, self.bands, self.rows))
+            if any(_is_near_duplicate(self._fields[other], fields, self.threshold)
+                   for key in keys for other in self._buckets.get(key, ())):
+                continue
+            index = len(self._fields)
+            self._fields.append(fields)
+            for key in keys:
+                self._buckets.setdefault(key, []).append(index)
+            fresh.append(article)
+        return fresh
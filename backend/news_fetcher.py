@@ -3,210 +3,343 @@
 News Fetcher Script
 -------------------
 Fetches news articles from a comprehensive list of RSS feeds and stores them in the database.
-All resources are included in the RSS_FEEDS list for future segregation.
+The feed list lives in feed_registry.RSS_FEEDS (re-exported here).
 """
 
+import asyncio
+import atexit
+import os
+import sys
 import requests
-import feedparser
-from bs4 import BeautifulSoup
+import aiohttp
 from sqlalchemy.orm import Session
 from models import News
+from bulk_writer import insert_ignore_duplicates
+from seen_urls import get_seen_index
+from feed_registry import RSS_FEEDS
+from feed_parsing import parse_feed_bytes, parse_feed_bytes_async
+from feed_archive import archive_response, get_feed_archive
+from feed_connections import FeedConnectionPool, ConnectionStats, create_feed_session, group_by_host
+from outbound import accept_headers, get as outbound_get, read_response_async, transfer_stats
+from feed_cursors import load_cursors, new_entries, advance_cursor
+from feed_health import (load_health, allow_request, record_success, record_failure,
+                         parse_retry_after, save_health)
+from feed_state import load_feed_states, conditional_headers, content_hash, is_unchanged, record_poll
 from datetime import datetime
-import email.utils
-from urllib.parse import urlparse, urlunparse, parse_qs, urlencode
-from sqlalchemy.exc import IntegrityError
 import time
+from collections import namedtuple
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
-# All news channels/resources (for future segregation)
-RSS_FEEDS = [
-    # UAE & Middle East
-    'https://www.khaleejtimes.com/rss',
-    'https://gulfnews.com/rss',
-    'https://www.thenationalnews.com/rss',
-    'https://www.arabianbusiness.com/feed',
-    'https://www.aljazeera.com/xml/rss/all.xml',
-    'https://www.arabnews.com/rss.xml',
-    'https://english.aawsat.com/home/rss.xml',
-    'https://www.reuters.com/rssfeed/worldnews',
-    'https://www.reuters.com/rssfeed/businessNews',
-    'https://www.reuters.com/rssfeed/technologyNews',
-    # Global Tech & Finance
-    'https://feeds.feedburner.com/TechCrunch/',
-    'https://www.wired.com/feed/rss',
-    'https://www.theverge.com/rss/index.xml',
-    'https://www.engadget.com/rss.xml',
-    'https://feeds.feedburner.com/venturebeat/SZYF',
-    'https://www.bloomberg.com/feed/podcast/etf-report.xml',
-    'https://feeds.feedburner.com/entrepreneur/latest',
-    # Financial News
-    'https://www.ft.com/rss/home',
-    'https://feeds.feedburner.com/FinancialTimes',
-    'https://www.economist.com/finance-and-economics/rss.xml',
-    'https://www.marketwatch.com/rss/topstories',
-    'https://feeds.feedburner.com/CoinDesk',
-    'https://cointelegraph.com/rss',
-    'https://decrypt.co/feed',
-    # AI & Tech
-    'https://www.artificialintelligence-news.com/feed/',
-    'https://www.techrepublic.com/rssfeeds/articles/',
-    'https://www.zdnet.com/news/rss.xml',
-    'https://www.techradar.com/rss',
-    'https://www.digitaltrends.com/feed/',
-    # Major World News
-    'http://feeds.bbci.co.uk/news/rss.xml',
-    'https://rss.cnn.com/rss/edition.rss',
-    'https://www.npr.org/rss/rss.php?id=1001',
-    'https://www.nytimes.com/services/xml/rss/nyt/HomePage.xml',
-    'https://www.theguardian.com/world/rss',
-    'https://www.hindustantimes.com/feeds/rss/world-news/rssfeed.xml',
-    'https://www.scmp.com/rss/91/feed',
-    # Business & Economy
-    'https://www.forbes.com/business/feed/',
-    'https://www.cnbc.com/id/10001147/device/rss/rss.html',
-    'https://www.businesstimes.com.sg/rss',
-    'https://www.business-standard.com/rss/latest.rss',
-    'https://www.economist.com/business/rss.xml',
-    # Niche/Regional/Other
-    'https://www.finextra.com/rss/news',
-    'https://www.pymnts.com/feed/',
-    'https://www.bankingtech.com/feed/',
-    'https://www.fintechfutures.com/feed/',
-    'https://www.americanbanker.com/feed',
-    'https://www.asiabankingandfinance.net/rss.xml',
-    'https://www.africanews.com/feed/rss',
-    'https://www.japantimes.co.jp/feed/',
-    'https://www.smh.com.au/rss/feed.xml',
-    'https://www.abc.net.au/news/feed/51120/rss.xml',
-    'https://www.moneycontrol.com/rss/markets.xml',
-    'https://www.moneycontrol.com/rss/fintech.xml',
-    'https://www.fintechnews.sg/feed/',
-    'https://www.fintechnews.ch/feed/',
-    'https://www.fintechnews.my/feed/',
-    'https://www.fintechnews.hk/feed/',
-    'https://www.fintechnews.ph/feed/',
-    'https://www.fintechnews.africa/feed/',
-    'https://www.finextra.com/rss/blogs',
-    'https://www.finextra.com/rss/events',
-]
-
-def normalize_url(url):
-    if not url:
-        return url
-    url = url.strip().lower()
-    if url.endswith('/'):
-        url = url[:-1]
-    parsed = urlparse(url)
-    qs = parse_qs(parsed.query)
-    filtered_qs = {k: v for k, v in qs.items() if not k.startswith('utm_')}
-    new_query = urlencode(filtered_qs, doseq=True)
-    normalized = urlunparse((parsed.scheme, parsed.netloc, parsed.path, parsed.params, new_query, parsed.fragment))
-    return normalized
-
-def fetch_and_store_news(db: Session):
+USER_AGENT = 'NewsPortal/1.0 (+https://example.com)'
+FEED_TIMEOUT = 10
+
+# Retry policy shared by the blocking and the concurrent fetchers
+RETRY_TOTAL = 3
+RETRY_BACKOFF_FACTOR = 1
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Longer Retry-After values are left to the circuit breaker instead of waited out
+MAX_INLINE_RETRY_AFTER = 30
+# Pause between feeds on the sequential path
+FEED_PACING_DELAY = float(os.getenv('FEED_PACING_DELAY', '0.2'))
+
+# Concurrency caps for the asyncio ingestion mode
+FEED_CONCURRENCY = int(os.getenv('FEED_CONCURRENCY', '16'))
+FEED_PER_HOST_CONCURRENCY = int(os.getenv('FEED_PER_HOST_CONCURRENCY', '2'))
+
+def _store_feed_entries(db: Session, parsed, feed_url=None, cursor=None):
+    """
+    Store the entries of a ParsedFeed in one batched insert. With a cursor,
+    processing stops at the first entry already ingested from this feed.
+    Known URLs are dropped by the seen-URL index; the unique constraint
+    catches the rest. Entries without a media image are stored with
+    image=NULL and picked up later by the image enrichment stage.
+    Returns (inserted, skipped, skipped_early, stored); stored is False when
+    the insert failed, in which case the cursor is left where it was and the
+    caller must not record the poll, so the next one fetches the body again.
+    """
+    rows = []
+    source = parsed.title
+    seen_index = get_seen_index(News.__tablename__)
+    entries, skipped_early, _ = new_entries(feed_url, parsed.entries, cursor)
+    new_urls = set(seen_index.filter_new(db, [entry.url for entry in entries]))
+    for entry in entries:
+        if entry.url not in new_urls:
+            continue
+        new_urls.discard(entry.url)
+        rows.append({
+            'title': entry.title,
+            'url': entry.url,
+            'excerpt': entry.excerpt,
+            'image': entry.image_candidates[0] if entry.image_candidates else None,
+            'published_at': entry.published_at or datetime.utcnow(),
+            'source': source,
+            'category': None,  # Category can be set later during segregation
+        })
+    try:
+        inserted, skipped = insert_ignore_duplicates(db, News, rows)
+        seen_index.add_many(row['url'] for row in rows)
+    except Exception as e:
+        # Log and rollback to keep session usable
+        print(f"Error saving articles from {source or 'feed'}: {e}")
+        db.rollback()
+        return 0, 0, skipped_early, False
+    advance_cursor(db, cursor, parsed.entries)
+    return inserted, skipped + len(entries) - len(rows), skipped_early, True
+
+def fetch_and_store_news(db: Session, feed_urls=None):
     # Create a requests session with retries and sensible headers
     session = requests.Session()
-    retries = Retry(total=3, backoff_factor=1, status_forcelist=(429, 500, 502, 503, 504))
+    retries = Retry(total=RETRY_TOTAL, backoff_factor=RETRY_BACKOFF_FACTOR, status_forcelist=RETRY_STATUSES)
     session.mount('https://', HTTPAdapter(max_retries=retries))
     session.mount('http://', HTTPAdapter(max_retries=retries))
     headers = {
-        'User-Agent': 'NewsPortal/1.0 (+https://example.com)'
+        'User-Agent': USER_AGENT
     }
 
-    for feed_url in RSS_FEEDS:
+    feed_urls = feed_urls or RSS_FEEDS
+    states = load_feed_states(db, feed_urls)
+    cursors = load_cursors(db, feed_urls)
+    ledger = load_health(db, feed_urls)
+    for feed_url in feed_urls:
+        state = states[feed_url]
+        health = ledger[feed_url]
+        if not allow_request(health):
+            continue
+        started = time.monotonic()
         try:
-            resp = session.get(feed_url, timeout=10, headers=headers)
+            resp, body = outbound_get(session, feed_url, 'feed', timeout=FEED_TIMEOUT,
+                                      headers={**headers, **conditional_headers(state)})
+            latency = time.monotonic() - started
+            archive_response(feed_url, resp.status_code, resp.headers, body)
+            if resp.status_code == 304:
+                record_success(health, 304, latency)
+                record_poll(db, state, 304)
+                continue
             if resp.status_code != 200:
                 print(f"Non-200 response for {feed_url}: {resp.status_code}")
+                record_failure(health, resp.status_code, latency=latency,
+                               retry_after=parse_retry_after(resp.headers.get('Retry-After')))
+                record_poll(db, state, resp.status_code)
+                continue
+            record_success(health, 200, latency, len(body))
+            body_hash = content_hash(body)
+            if is_unchanged(state, resp.status_code, body_hash):
+                record_poll(db, state, 200, resp.headers, body_hash)
                 continue
-            d = feedparser.parse(resp.content)
+            parsed = parse_feed_bytes(body, feed_url)
         except Exception as e:
             print(f"Error fetching {feed_url}: {e}")
+            record_failure(health, error=e, latency=time.monotonic() - started)
+            save_health(db)
             # polite short delay to avoid hammering next feed if network is flaky
             time.sleep(0.5)
             continue
-        for entry in d.entries:
-            title = entry.get('title', '')
-            url = normalize_url(entry.get('link', ''))
-            excerpt = entry.get('summary', '')
-            published = entry.get('published', '')
-            source = d.feed.get('title', '')
-            image = None
-        # Try to extract image from entry or fallback to scraping
-            if 'media_content' in entry and entry['media_content']:
-                image = entry['media_content'][0].get('url')
-            elif 'media_thumbnail' in entry and entry['media_thumbnail']:
-                image = entry['media_thumbnail'][0].get('url')
-            else:
-                # Fallback: scrape Open Graph image
-                try:
-                    resp_img = session.get(url, timeout=5, headers=headers)
-                    soup = BeautifulSoup(resp_img.text, 'html.parser')
-                    og_img = soup.find('meta', property='og:image')
-                    if og_img:
-                        image = og_img.get('content')
-                except Exception:
-                    pass
-            # Parse published date
-            published_at = None
+        *_, stored = _store_feed_entries(db, parsed, feed_url, cursors[feed_url])
+        if stored:
+            record_poll(db, state, 200, resp.headers, body_hash, parsed.title)
+        # polite pacing between feeds
+        time.sleep(FEED_PACING_DELAY)
+
+def _retry_delay(errors, retry_after=None):
+    """Backoff before the next attempt, matching urllib3's Retry schedule."""
+    if retry_after is not None:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+    if errors <= 1:
+        return 0
+    return RETRY_BACKOFF_FACTOR * (2 ** (errors - 1))
+
+async def _fetch_feed_async(session, feed_url, extra_headers=None):
+    """
+    GET a feed, retrying connection errors and RETRY_STATUSES like the
+    blocking session does. Returns (status, headers, body); oversized
+    bodies raise outbound.ResponseTooLarge.
+    """
+    headers = accept_headers({'User-Agent': USER_AGENT, **(extra_headers or {})})
+    errors = 0
+    while True:
+        retry_after = None
+        try:
+            async with session.get(feed_url, headers=headers) as resp:
+                retry_after = resp.headers.get('Retry-After')
+                if (resp.status not in RETRY_STATUSES or errors >= RETRY_TOTAL
+                        or _retry_delay(errors + 1, retry_after) > MAX_INLINE_RETRY_AFTER):
+                    body = await read_response_async(resp, 'feed', decoded_by_client=session.auto_decompress)
+                    return resp.status, resp.headers, body
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            if errors >= RETRY_TOTAL:
+                raise
+        errors += 1
+        await asyncio.sleep(_retry_delay(errors, retry_after))
+
+FeedPoll = namedtuple('FeedPoll', 'feed_url status headers nbytes body_hash parsed error latency')
+
+async def _poll_feed(session, feed_url, state):
+    """
+    Fetch one feed and, if its body changed, parse it on the process pool.
+    Returns a FeedPoll; `parsed` is None when the body was unchanged.
+    """
+    started = time.monotonic()
+    try:
+        status, headers, body = await _fetch_feed_async(session, feed_url, conditional_headers(state))
+    except Exception as e:
+        return FeedPoll(feed_url, None, None, 0, None, None, e, time.monotonic() - started)
+    latency = time.monotonic() - started
+    if get_feed_archive() is not None:
+        await asyncio.to_thread(archive_response, feed_url, status, headers, body)
+    body_hash = content_hash(body) if status == 200 else None
+    parsed, error = None, None
+    if status == 200 and not is_unchanged(state, status, body_hash):
+        try:
+            parsed = await parse_feed_bytes_async(asyncio.get_running_loop(), body, feed_url)
+        except Exception as e:
+            error = e
+    return FeedPoll(feed_url, status, headers, len(body or b''), body_hash, parsed, error, latency)
+
+async def fetch_and_store_news_async(db: Session, feed_urls=None,
+                                     max_concurrency=FEED_CONCURRENCY,
+                                     per_host_limit=FEED_PER_HOST_CONCURRENCY,
+                                     session=None, connection_stats=None):
+    """
+    Concurrent variant of fetch_and_store_news.
+
+    Feeds are grouped by host: each host gets up to `per_host_limit` lanes
+    that poll its feeds one after another over kept-alive connections, while
+    different hosts run in parallel (capped at `max_concurrency`). Results are
+    stored as they arrive. Pass a long-lived `session` to reuse connections
+    and DNS answers across cycles; otherwise one is created for this call.
+    Returns a stats dict including the cycle wall-time and handshake overhead.
+    """
+    feed_urls = RSS_FEEDS if feed_urls is None else feed_urls
+    started = time.monotonic()
+    stats = {'feeds': len(feed_urls), 'fetched': 0, 'not_modified': 0, 'failed': 0, 'circuit_open': 0, 'added': 0,
+             'duplicates': 0, 'skipped_early': 0, 'feed_latencies': {}, 'feed_entries': {},
+             'dates': {'parsed': 0, 'fallbacks': 0, 'failed': 0}}
+    states = load_feed_states(db, feed_urls)
+    cursors = load_cursors(db, feed_urls)
+    ledger = load_health(db, feed_urls)
+    allowed = [url for url in feed_urls if allow_request(ledger[url])]
+    stats['circuit_open'] = len(feed_urls) - len(allowed)
+
+    connection_stats = connection_stats or ConnectionStats()
+    transfer_before = transfer_stats.totals('feed')
+    owns_session = session is None
+    if owns_session:
+        session = create_feed_session(max_concurrency, per_host_limit, FEED_TIMEOUT, connection_stats)
+
+    results = asyncio.Queue()
+
+    async def poll_lane(urls):
+        for url in urls:
             try:
-                if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                    published_at = datetime(*entry.published_parsed[:6])
-                elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
-                    published_at = datetime(*entry.updated_parsed[:6])
-                elif published:
-                    try:
-                        parsed_date = email.utils.parsedate_tz(published)
-                        if parsed_date:
-                            published_at = datetime(*parsed_date[:6])
-                    except:
-                        pass
-                if not published_at:
-                    published_at = datetime.utcnow()
+                poll = await _poll_feed(session, url, states[url])
             except Exception as e:
-                print(f"Date parsing error for {url}: {e}")
-                published_at = datetime.utcnow()
-            # Avoid duplicates and handle DB integrity errors
-            if not url:
+                poll = FeedPoll(url, None, None, 0, None, None, e, 0.0)
+            await results.put(poll)
+
+    lanes = []
+    for host_urls in group_by_host(allowed).values():
+        width = max(1, min(per_host_limit, len(host_urls)))
+        lanes += [asyncio.create_task(poll_lane(host_urls[i::width])) for i in range(width)]
+    try:
+        for _ in range(len(allowed)):
+            poll = await results.get()
+            feed_url, status, headers, body_hash, parsed = (
+                poll.feed_url, poll.status, poll.headers, poll.body_hash, poll.parsed)
+            state = states[feed_url]
+            health = ledger[feed_url]
+            stats['feed_latencies'][feed_url] = round(poll.latency, 3)
+            if poll.error is not None:
+                print(f"Error fetching {feed_url}: {poll.error}")
+                record_failure(health, status, poll.error, poll.latency)
+                save_health(db)
+                stats['failed'] += 1
+                continue
+            if status == 304:
+                record_success(health, 304, poll.latency)
+                record_poll(db, state, 304)
+                stats['not_modified'] += 1
                 continue
+            if status != 200:
+                print(f"Non-200 response for {feed_url}: {status}")
+                record_failure(health, status, latency=poll.latency,
+                               retry_after=parse_retry_after(headers.get('Retry-After')))
+                record_poll(db, state, status)
+                stats['failed'] += 1
+                continue
+            record_success(health, 200, poll.latency, poll.nbytes)
+            if parsed is None:
+                # Body identical to the last poll; parsing was skipped
+                record_poll(db, state, 200, headers, body_hash)
+                stats['not_modified'] += 1
+                continue
+            stats['fetched'] += 1
+            added, duplicates, skipped_early, stored = _store_feed_entries(db, parsed, feed_url, cursors[feed_url])
+            stats['added'] += added
+            stats['duplicates'] += duplicates
+            stats['skipped_early'] += skipped_early
+            stats['feed_entries'][feed_url] = {
+                'entries': len(parsed.entries), 'added': added, 'skipped_early': skipped_early,
+                'dates': parsed.date_stats,
+            }
+            for key, count in (parsed.date_stats or {}).items():
+                stats['dates'][key] += count
+            if stored:
+                # Otherwise keep the old validators so the next poll refetches the body
+                record_poll(db, state, 200, headers, body_hash, parsed.title)
+    finally:
+        for lane in lanes:
+            lane.cancel()
+        await asyncio.gather(*lanes, return_exceptions=True)
+        if owns_session:
+            await session.close()
 
-            try:
-                exists = db.query(News).filter_by(url=url).first()
-            except Exception:
-                exists = None
+    stats['connections'] = connection_stats.snapshot()
+    transfer_after = transfer_stats.totals('feed')
+    stats['wire_bytes'] = transfer_after['wire_bytes'] - transfer_before['wire_bytes']
+    stats['decoded_bytes'] = transfer_after['decoded_bytes'] - transfer_before['decoded_bytes']
+    stats['elapsed_seconds'] = round(time.monotonic() - started, 2)
+    print(f"Fetch cycle finished in {stats['elapsed_seconds']}s: "
+          f"{stats['fetched']}/{stats['feeds']} feeds changed, {stats['not_modified']} unchanged, "
+          f"{stats['failed']} failed, {stats['circuit_open']} skipped by open circuits, {stats['added']} new articles, "
+          f"{stats['skipped_early']} entries skipped by cursors, "
+          f"{stats['dates']['failed']} unparseable dates ({stats['dates']['fallbacks']} format fallbacks); "
+          f"{stats['connections']['created']} new connections "
+          f"({stats['connections']['handshake_ms']}ms connecting), "
+          f"{stats['connections']['reused']} reused; "
+          f"{stats['wire_bytes'] // 1024}KB on the wire, {stats['decoded_bytes'] // 1024}KB decoded")
+    return stats
 
-            if exists:
-                # already in DB, skip
-                continue
+_connection_pool = None
 
-            news = News(
-                title=title,
-                url=url,
-                excerpt=excerpt,
-                image=image,
-                published_at=published_at,
-                source=source,
-                category=None  # Category can be set later during segregation
-            )
-            db.add(news)
-            try:
-                db.commit()
-            except IntegrityError:
-                # another thread/process inserted the same URL concurrently
-                db.rollback()
-            except Exception as e:
-                # Log and rollback to keep session usable
-                print(f"Error saving article {url}: {e}")
-                db.rollback()
-        # polite pacing between feeds
-        time.sleep(0.2)
+def feed_connection_pool():
+    """Process-wide pool whose session outlives individual fetch cycles."""
+    global _connection_pool
+    if _connection_pool is None:
+        _connection_pool = FeedConnectionPool(FEED_CONCURRENCY, FEED_PER_HOST_CONCURRENCY, FEED_TIMEOUT)
+        atexit.register(_connection_pool.close)
+    return _connection_pool
+
+def fetch_and_store_news_concurrent(db: Session, **kwargs):
+    """
+    Blocking entry point for the asyncio ingestion mode (for worker threads).
+    Cycles share the process-wide connection pool and its keep-alive connections.
+    """
+    pool = feed_connection_pool()
+    return pool.run(lambda session: fetch_and_store_news_async(
+        db, session=session, connection_stats=pool.stats, **kwargs))
 
 if __name__ == "__main__":
     from database import SessionLocal
     db = SessionLocal()
     try:
-        fetch_and_store_news(db)
+        if '--sequential' in sys.argv:
+            fetch_and_store_news(db)
+        else:
+            fetch_and_store_news_concurrent(db)
         print("News fetching complete.")
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
@@ -0,0 +1,88 @@
+"""
+Head-only og:image Extractor
+----------------------------
+Streams an article page and stops reading at </head> (or a byte cap), then
+pulls og:image / twitter:image out of the raw bytes with a small regex
+tokenizer instead of decoding the page and building a soup tree.
+"""
+
+import html
+import re
+from urllib.parse import urljoin
+import requests
+from outbound import accept_headers, source_of, transfer_stats
+
+HEAD_MAX_BYTES = 64 * 1024
+CHUNK_SIZE = 8 * 1024
+
+_META_TAG = re.compile(rb'<meta\b[^>]*>', re.IGNORECASE)
+_ATTRIBUTE = re.compile(rb'([a-zA-Z_:][-\w:.]*)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s"\'>]+))')
+_HEAD_END = b'</head'
+
+# Lower rank wins; og:image beats twitter:image
+_IMAGE_KEYS = {
+    b'og:image': 0,
+    b'og:image:url': 0,
+    b'og:image:secure_url': 1,
+    b'twitter:image': 2,
+    b'twitter:image:src': 2,
+}
+
+
+def read_html_prefix(resp, max_bytes=HEAD_MAX_BYTES, stop_at_head=True):
+    """
+    Read a streamed requests response up to `max_bytes`, stopping early once
+    </head> has been seen when `stop_at_head` is set. Returns raw bytes.
+    """
+    buf = bytearray()
+    for chunk in resp.iter_content(CHUNK_SIZE):
+        if not chunk:
+            continue
+        # Only rescan the new chunk plus enough overlap to catch a split tag
+        scan_from = max(0, len(buf) - len(_HEAD_END))
+        buf += chunk
+        if stop_at_head:
+            end = bytes(buf[scan_from:]).lower().find(_HEAD_END)
+            if end != -1:
+                return bytes(buf[:scan_from + end])
+        if len(buf) >= max_bytes:
+            return bytes(buf[:max_bytes])
+    return bytes(buf)
+
+def fetch_html_prefix(url, session=None, timeout=5, max_bytes=HEAD_MAX_BYTES,
+                      stop_at_head=True, headers=None):
+    """GET `url` with a streamed response and return its leading bytes."""
+    client = session or requests
+    with client.get(url, timeout=timeout, headers=accept_headers(headers), stream=True) as resp:
+        prefix = read_html_prefix(resp, max_bytes, stop_at_head)
+        transfer_stats.record(source_of(url), 'article', resp.raw.tell(), len(prefix))
+        return prefix
+
+def extract_meta_image(head, base_url=None):
+    """Return the og:image (falling back to twitter:image) declared in `head`."""
+    best, best_rank = None, None
+    for tag in _META_TAG.finditer(head):
+        attrs = {}
+        for match in _ATTRIBUTE.finditer(tag.group(0)):
+            value = match.group(2)
+            if value is None:
+                value = match.group(3) if match.group(3) is not None else match.group(4)
+            attrs[match.group(1).lower()] = value
+        key = (attrs.get(b'property') or attrs.get(b'name') or b'').strip().lower()
+        rank = _IMAGE_KEYS.get(key)
+        content = attrs.get(b'content')
+        if rank is None or not content:
+            continue
+        if best_rank is None or rank < best_rank:
+            best, best_rank = content, rank
+            if rank == 0:
+                break
+    if best is None:
+        return None
+    image = html.unescape(best.decode('utf-8', 'replace')).strip()
+    return urljoin(base_url, image) if base_url else image
+
+def fetch_og_image(url, session=None, timeout=5, max_bytes=HEAD_MAX_BYTES):
+    """Return (image_url, raw_head_bytes) for an article page."""
+    head = fetch_html_prefix(url, session=session, timeout=timeout, max_bytes=max_bytes)
+    return extract_meta_image(head, base_url=url), head
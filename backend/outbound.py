@@ -0,0 +1,258 @@
+"""
+Outbound HTTP Layer
+-------------------
+Shared helpers for every outbound fetch (feeds, article pages, API JSON):
+
+* always advertise compressed encodings (gzip/deflate, plus br when a
+  Brotli decoder that can cap its output is installed),
+* stream bodies against a hard per-resource-type size cap and abort as soon
+  as the cap is crossed, whether the excess comes from the wire or from
+  decompression,
+* count bytes on the wire vs decoded bytes per source.
+
+Works with blocking `requests` responses (stream=True) and with aiohttp
+responses. aiohttp sessions made by client_session() leave decompression to
+this module so the compressed byte count is exact.
+"""
+
+import os
+import threading
+import zlib
+from urllib.parse import urlparse
+import aiohttp
+import requests
+
+try:
+    import brotli as _brotli
+except ImportError:
+    try:
+        import brotlicffi as _brotli
+    except ImportError:
+        _brotli = None
+
+
+def _brotli_output_is_bounded():
+    """True when Decompressor.process() accepts output_buffer_limit (brotli >= 1.1)."""
+    try:
+        _brotli.Decompressor().process(_brotli.compress(b'x'), output_buffer_limit=1)
+    except TypeError:
+        return False
+    except Exception:
+        return True
+    return True
+
+# br is only negotiated when its output can be capped like gzip/deflate
+_brotli = _brotli if _brotli is not None and _brotli_output_is_bounded() else None
+
+CHUNK_SIZE = 16 * 1024
+
+# Hard caps on decoded body size per resource type
+MAX_BYTES = {
+    'feed': int(os.getenv('OUTBOUND_MAX_FEED_BYTES', str(5 * 1024 * 1024))),
+    'article': int(os.getenv('OUTBOUND_MAX_ARTICLE_BYTES', str(2 * 1024 * 1024))),
+    'api': int(os.getenv('OUTBOUND_MAX_API_BYTES', str(4 * 1024 * 1024))),
+}
+
+ACCEPT_ENCODING = 'gzip, deflate, br' if _brotli is not None else 'gzip, deflate'
+
+
+class ResponseTooLarge(Exception):
+    """Raised when a body exceeds the cap for its resource type."""
+
+    def __init__(self, url, kind, limit, seen):
+        super().__init__(f"{kind} response from {url} exceeds {limit} bytes (read {seen})")
+        self.url = url
+        self.kind = kind
+        self.limit = limit
+        self.seen = seen
+
+
+def limit_for(kind):
+    return MAX_BYTES[kind]
+
+def accept_headers(headers=None):
+    """`headers` plus Accept-Encoding, unless the caller already set one."""
+    merged = dict(headers or {})
+    if not any(key.lower() == 'accept-encoding' for key in merged):
+        merged['Accept-Encoding'] = ACCEPT_ENCODING
+    return merged
+
+def source_of(url):
+    return urlparse(str(url)).netloc.lower()
+
+
+class TransferStats:
+    """Thread-safe per-source and per-kind counters of wire vs decoded bytes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.sources = {}
+        self.kinds = {}
+
+    @staticmethod
+    def _bump(table, key, wire, decoded, aborted):
+        entry = table.setdefault(key, {'responses': 0, 'wire_bytes': 0, 'decoded_bytes': 0, 'aborted': 0})
+        entry['responses'] += 1
+        entry['wire_bytes'] += wire
+        entry['decoded_bytes'] += decoded
+        entry['aborted'] += int(aborted)
+
+    def record(self, source, kind, wire, decoded, aborted=False):
+        with self._lock:
+            self._bump(self.sources, source, wire, decoded, aborted)
+            self._bump(self.kinds, kind, wire, decoded, aborted)
+
+    def totals(self, kind):
+        with self._lock:
+            return dict(self.kinds.get(kind, {'responses': 0, 'wire_bytes': 0, 'decoded_bytes': 0, 'aborted': 0}))
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'sources': {source: dict(entry) for source, entry in self.sources.items()},
+                'kinds': {kind: dict(entry) for kind, entry in self.kinds.items()},
+            }
+
+
+transfer_stats = TransferStats()
+
+
+def _check_declared_length(headers, url, kind, limit):
+    """Abort before reading when an uncompressed Content-Length is already too big."""
+    encoding = (headers.get('Content-Encoding') or 'identity').lower()
+    length = headers.get('Content-Length')
+    if encoding == 'identity' and length and length.isdigit() and int(length) > limit:
+        raise ResponseTooLarge(url, kind, limit, int(length))
+
+def read_response(resp, kind, source=None, limit=None):
+    """
+    Read a `requests` response opened with stream=True, enforcing the size
+    cap for `kind`. urllib3 decodes gzip/deflate/br; raw.tell() reports the
+    compressed bytes consumed.
+    """
+    limit = limit or limit_for(kind)
+    source = source or source_of(resp.url)
+    body = bytearray()
+    try:
+        _check_declared_length(resp.headers, resp.url, kind, limit)
+        for chunk in resp.iter_content(CHUNK_SIZE):
+            body += chunk
+            if len(body) > limit:
+                raise ResponseTooLarge(resp.url, kind, limit, len(body))
+    except ResponseTooLarge:
+        transfer_stats.record(source, kind, resp.raw.tell(), len(body), aborted=True)
+        resp.close()
+        raise
+    transfer_stats.record(source, kind, resp.raw.tell(), len(body))
+    return bytes(body)
+
+def get(session, url, kind, source=None, headers=None, limit=None, **kwargs):
+    """GET with compression negotiated and the body size-capped. Returns (response, body)."""
+    client = session or requests
+    resp = client.get(url, headers=accept_headers(headers), stream=True, **kwargs)
+    with resp:
+        body = read_response(resp, kind, source, limit)
+    return resp, body
+
+
+class _Decoder:
+    """Incremental Content-Encoding decoder that never inflates past `limit` bytes."""
+
+    def __init__(self, encoding):
+        self.encoding = (encoding or 'identity').strip().lower()
+        if self.encoding in ('gzip', 'x-gzip'):
+            self._zlib = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif self.encoding == 'deflate':
+            self._zlib = zlib.decompressobj()
+            self._first = True
+        elif self.encoding == 'br':
+            if _brotli is None:
+                raise ValueError("br response received but no bounded Brotli decoder is installed")
+            self._brotli = _brotli.Decompressor()
+        elif self.encoding != 'identity':
+            raise ValueError(f"Unsupported Content-Encoding: {encoding}")
+
+    def decode(self, chunk, room):
+        """Decode `chunk`, producing at most `room` + 1 bytes (one more signals overflow)."""
+        if self.encoding == 'identity':
+            return chunk
+        if self.encoding == 'br':
+            return self._brotli.process(chunk, output_buffer_limit=room + 1)
+        if self.encoding == 'deflate' and self._first:
+            self._first = False
+            try:
+                return self._zlib.decompress(chunk, room + 1)
+            except zlib.error:
+                # Some servers send raw deflate without the zlib header
+                self._zlib = zlib.decompressobj(-zlib.MAX_WBITS)
+        return self._zlib.decompress(chunk, room + 1)
+
+    def flush(self):
+        if self.encoding in ('gzip', 'x-gzip', 'deflate'):
+            return self._zlib.flush()
+        return b''
+
+
+async def iter_response_async(resp, kind, source=None, limit=None, decoded_by_client=False):
+    """
+    Yield the decoded body of an aiohttp response chunk by chunk under the
+    size cap for `kind`, so callers can parse while bytes arrive. Unless the
+    session decompresses itself (`decoded_by_client`), chunks are decoded here
+    from the raw stream so wire and decoded sizes are both known.
+    """
+    limit = limit or limit_for(kind)
+    url = str(resp.url)
+    source = source or source_of(url)
+    decoder = _Decoder('identity' if decoded_by_client else resp.headers.get('Content-Encoding'))
+    decoded = 0
+    wire = 0
+    try:
+        _check_declared_length(resp.headers, url, kind, limit)
+        async for chunk in resp.content.iter_chunked(CHUNK_SIZE):
+            wire += len(chunk)
+            data = decoder.decode(chunk, limit - decoded)
+            decoded += len(data)
+            if decoded > limit:
+                raise ResponseTooLarge(url, kind, limit, decoded)
+            if data:
+                yield data
+        data = decoder.flush()
+        decoded += len(data)
+        if decoded > limit:
+            raise ResponseTooLarge(url, kind, limit, decoded)
+        if data:
+            yield data
+    except ResponseTooLarge:
+        if decoded_by_client:
+            wire = int(resp.headers.get('Content-Length') or wire)
+        transfer_stats.record(source, kind, wire, decoded, aborted=True)
+        resp.close()
+        raise
+    if decoded_by_client:
+        # The client already inflated the stream; the declared length is the wire size
+        wire = int(resp.headers.get('Content-Length') or wire)
+    transfer_stats.record(source, kind, wire, decoded)
+
+async def read_response_async(resp, kind, source=None, limit=None, decoded_by_client=False):
+    """Read a whole aiohttp response under the size cap for `kind` (see iter_response_async)."""
+    body = bytearray()
+    async for data in iter_response_async(resp, kind, source, limit, decoded_by_client):
+        body += data
+    return bytes(body)
+
+def client_session(**kwargs):
+    """
+    aiohttp ClientSession that leaves decompression to read_response_async.
+    Every request advertises only the encodings _Decoder can bound, instead
+    of aiohttp's default Accept-Encoding.
+    """
+    kwargs.setdefault('auto_decompress', False)
+    kwargs['headers'] = accept_headers(kwargs.get('headers'))
+    return aiohttp.ClientSession(**kwargs)
+
+async def get_async(session, url, kind, source=None, headers=None, limit=None, **kwargs):
+    """GET with compression negotiated and the body size-capped. Returns (status, headers, body)."""
+    decoded_by_client = getattr(session, 'auto_decompress', True)
+    async with session.get(url, headers=accept_headers(headers), **kwargs) as resp:
+        body = await read_response_async(resp, kind, source, limit, decoded_by_client)
+        return resp.status, resp.headers, body
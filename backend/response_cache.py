@@ -0,0 +1,170 @@
+"""
+API Response Cache
+------------------
+Disk-backed cache of external news API responses, so refreshes that follow
+each other within a source's TTL reuse the last answer instead of spending
+quota and latency on an identical one.
+
+Entries are keyed by source, endpoint and normalized query parameters
+(credentials excluded) and stored one file per response. The cache is
+bounded in total bytes, evicting the least recently used entries first.
+Set RESPONSE_CACHE_MAX_BYTES=0 to disable it.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_DIR = os.getenv(
+    'RESPONSE_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'newsportal-response-cache'))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv('RESPONSE_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+
+# Seconds a response stays fresh, per source; RESPONSE_CACHE_TTL_<SOURCE> overrides
+DEFAULT_TTLS = {
+    'newsapi': 300,
+    'guardian': 300,
+    'nytimes': 600,
+    'reddit': 60,
+}
+RESPONSE_CACHE_TTLS = {
+    source: int(os.getenv(f'RESPONSE_CACHE_TTL_{source.upper()}', str(ttl)))
+    for source, ttl in DEFAULT_TTLS.items()
+}
+
+# Query parameters that carry credentials rather than select content
+CREDENTIAL_PARAMS = {'apikey', 'api-key', 'api_key', 'key', 'token'}
+
+
+def cache_key(source: str, url: str, params: Optional[Dict] = None) -> str:
+    normalized = sorted(
+        (str(name), str(value)) for name, value in (params or {}).items()
+        if value is not None and str(name).lower() not in CREDENTIAL_PARAMS
+    )
+    material = json.dumps([source, url.rstrip('/'), normalized], separators=(',', ':'))
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """
+    TTL + LRU cache of response bodies on disk. A file's mtime is when the
+    response was stored; recency of use is tracked in memory and seeded from
+    access times when the directory is reopened.
+    """
+
+    def __init__(self, root: str, max_bytes: int = RESPONSE_CACHE_MAX_BYTES,
+                 ttls: Optional[Dict[str, int]] = None, default_ttl: int = 60):
+        self.root = os.path.abspath(root)
+        self.max_bytes = max_bytes
+        self.ttls = dict(RESPONSE_CACHE_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.hits = self.misses = self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> size, least recently used first
+        self._size = 0
+        os.makedirs(self.root, exist_ok=True)
+        self._load_index()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.body")
+
+    def _load_index(self):
+        found = []
+        for name in os.listdir(self.root):
+            if not name.endswith('.body'):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.root, name))
+            except OSError:
+                continue
+            found.append((stat.st_atime, name[:-len('.body')], stat.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._size += size
+
+    def ttl_for(self, source: str) -> int:
+        return self.ttls.get(source, self.default_ttl)
+
+    def get(self, source: str, url: str, params: Optional[Dict] = None) -> Optional[bytes]:
+        """The cached body if it is younger than the source's TTL, else None"""
+        key = cache_key(source, url, params)
+        path = self._path(key)
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            try:
+                stored_at = os.stat(path).st_mtime
+                if time.time() - stored_at > self.ttl_for(source):
+                    self._remove(key)
+                    self.misses += 1
+                    return None
+                with open(path, 'rb') as f:
+                    body = f.read()
+                os.utime(path, (time.time(), stored_at))
+            except OSError:
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def put(self, source: str, url: str, params: Optional[Dict], body: bytes):
+        if len(body) > self.max_bytes:
+            return
+        key = cache_key(source, url, params)
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with self._lock:
+            try:
+                with open(tmp_path, 'wb') as f:
+                    f.write(body)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logger.warning(f"Could not cache {source} response: {e}")
+                return
+            self._size += len(body) - self._entries.pop(key, 0)
+            self._entries[key] = len(body)
+            while self._size > self.max_bytes and self._entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key: str):
+        self._size -= self._entries.pop(key, 0)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+
+_cache = None
+_unavailable = False
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """The process-wide cache, or None when disabled or the directory is unusable"""
+    global _cache, _unavailable
+    if _cache is None and not _unavailable and RESPONSE_CACHE_MAX_BYTES > 0:
+        try:
+            _cache = ResponseCache(RESPONSE_CACHE_DIR)
+        except OSError as e:
+            logger.warning(f"API response cache disabled: {e}")
+            _unavailable = True
+    return _cache
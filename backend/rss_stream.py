@@ -0,0 +1,134 @@
+"""
+Streaming RSS/Atom Parser
+Parses RSS <item> and Atom <entry> elements with lxml as the feed arrives,
+clearing each element once it has been read, so memory per feed stays flat
+no matter how long the feed is.
+"""
+
+import html
+import io
+import re
+from typing import Dict, Iterable, Iterator, List, Union
+from lxml import etree
+
+ITEM_TAGS = ('{*}item', '{*}entry')
+DESCRIPTION_CHARS = 500
+
+_TAG = re.compile(r'<[^>]*>')
+_SPACES = re.compile(r'\s+')
+
+_PARSER_OPTIONS = dict(recover=True, resolve_entities=False, no_network=True, remove_comments=True)
+
+
+def strip_tags(markup: str) -> str:
+    """Drop HTML tags and entities; enough for feed descriptions, not a sanitizer"""
+    if not markup:
+        return ""
+    if '<' in markup:
+        markup = _TAG.sub(' ', markup)
+    if '&' in markup:
+        markup = html.unescape(markup)
+    return _SPACES.sub(' ', markup).strip()
+
+
+def _localname(element) -> str:
+    tag = element.tag
+    if not isinstance(tag, str):  # comments and processing instructions
+        return ""
+    return tag.rsplit('}', 1)[-1]
+
+def _text(element) -> str:
+    return ''.join(element.itertext()).strip()
+
+def _atom_link(element) -> str:
+    rel = element.get('rel', 'alternate')
+    return element.get('href', '') if rel == 'alternate' else ''
+
+def _image_url(element) -> str:
+    name = _localname(element)
+    if name in ('content', 'thumbnail') and element.get('url'):
+        if name == 'thumbnail' or element.get('medium') == 'image' or (element.get('type') or '').startswith('image/'):
+            return element.get('url')
+    if name == 'enclosure' and (element.get('type') or '').startswith('image/'):
+        return element.get('url', '')
+    return ''
+
+def item_fields(item) -> Dict[str, str]:
+    """title, link, description, published, author and image_url of one item/entry"""
+    fields = {"title": "", "link": "", "description": "", "published": "", "author": "", "image_url": ""}
+    content = ""
+    for child in item:
+        name = _localname(child)
+        if name == 'title':
+            fields["title"] = _text(child)
+        elif name == 'link':
+            # RSS puts the URL in the text, Atom in href
+            fields["link"] = fields["link"] or (child.text or '').strip() or _atom_link(child)
+        elif name in ('description', 'summary'):
+            fields["description"] = _text(child)
+        elif name in ('content', 'encoded') and not child.get('url'):
+            content = content or _text(child)
+        elif name in ('pubDate', 'published', 'date') or (name == 'updated' and not fields["published"]):
+            fields["published"] = _text(child)
+        elif name in ('author', 'creator') and not fields["author"]:
+            names = [_text(grandchild) for grandchild in child if _localname(grandchild) == 'name']
+            fields["author"] = names[0] if names else _text(child)
+        elif not fields["image_url"]:
+            fields["image_url"] = _image_url(child)
+    fields["description"] = strip_tags(fields["description"] or content)[:DESCRIPTION_CHARS]
+    return fields
+
+def _release(item):
+    """Free a parsed item and the siblings already handled before it"""
+    item.clear()
+    parent = item.getparent()
+    if parent is not None:
+        while item.getprevious() is not None:
+            del parent[0]
+
+
+class FeedStreamParser:
+    """
+    Incremental parser: feed() it body chunks as they are downloaded and it
+    returns the items completed so far; close() returns the rest.
+    Malformed markup is recovered from rather than raised.
+    """
+
+    def __init__(self):
+        self._parser = etree.XMLPullParser(events=('end',), tag=ITEM_TAGS, **_PARSER_OPTIONS)
+
+    def _drain(self) -> List[Dict[str, str]]:
+        items = []
+        for _, item in self._parser.read_events():
+            items.append(item_fields(item))
+            _release(item)
+        return items
+
+    def feed(self, chunk: bytes) -> List[Dict[str, str]]:
+        self._parser.feed(chunk)
+        return self._drain()
+
+    def close(self) -> List[Dict[str, str]]:
+        try:
+            self._parser.close()
+        except etree.XMLSyntaxError:
+            pass
+        return self._drain()
+
+
+def iter_feed_items(source: Union[bytes, str, Iterable[bytes]]) -> Iterator[Dict[str, str]]:
+    """Stream the items of a complete feed body (bytes or str) or an iterable of byte chunks"""
+    if isinstance(source, str):
+        source = source.encode('utf-8')
+    if isinstance(source, bytes):
+        try:
+            for _, item in etree.iterparse(io.BytesIO(source), events=('end',), tag=ITEM_TAGS, **_PARSER_OPTIONS):
+                yield item_fields(item)
+                _release(item)
+        except etree.XMLSyntaxError:
+            return
+        return
+    parser = FeedStreamParser()
+    for chunk in source:
+        yield from parser.feed(chunk)
+    yield from parser.close()
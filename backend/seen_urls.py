@@ -0,0 +1,163 @@
+"""
+Seen-URL Index
+--------------
+Process-wide dedupe index over stored article URLs. Each table gets a Bloom
+filter loaded once from the database; URLs the filter has never seen are
+new without any I/O, and only positive hits are confirmed against the DB in
+one batched query. Confirmed duplicates are remembered so repeat polls of the
+same feed entries are rejected from memory.
+"""
+
+import hashlib
+import math
+import threading
+from collections import OrderedDict
+from sqlalchemy import text, bindparam
+from sqlalchemy.orm import Session
+
+BLOOM_ERROR_RATE = 0.01
+BLOOM_MIN_CAPACITY = 10000
+CONFIRMED_CACHE_SIZE = 50000
+
+# Tables holding article URLs on each ingestion path
+SEEN_URL_TABLES = ('news', 'news_articles')
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings using double hashing of one
+    blake2b digest.
+    """
+
+    def __init__(self, capacity, error_rate=BLOOM_ERROR_RATE):
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.size = max(8, int(math.ceil(-self.capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.hash_count = max(1, int(round(self.size / self.capacity * math.log(2))))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, item):
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    @property
+    def saturated(self):
+        return self.count > self.capacity
+
+
+class SeenUrlIndex:
+    """
+    Dedupe index for one table's URL column.
+    """
+
+    def __init__(self, table, column='url', error_rate=BLOOM_ERROR_RATE,
+                 confirmed_size=CONFIRMED_CACHE_SIZE):
+        self.table = table
+        self.column = column
+        self.error_rate = error_rate
+        self.confirmed_size = confirmed_size
+        self.bloom = None
+        self._confirmed = OrderedDict()  # url -> None, LRU of known duplicates
+        self._lock = threading.RLock()
+        self.stats = {'checked': 0, 'bloom_negative': 0, 'memory_hits': 0, 'db_confirmed': 0,
+                      'false_positives': 0}
+
+    @property
+    def loaded(self):
+        return self.bloom is not None
+
+    def load(self, db: Session):
+        """(Re)build the Bloom filter from every URL currently in the table."""
+        urls = [row[0] for row in db.execute(text(f"SELECT {self.column} FROM {self.table}")) if row[0]]
+        bloom = BloomFilter(max(BLOOM_MIN_CAPACITY, len(urls) * 2), self.error_rate)
+        for url in urls:
+            bloom.add(url)
+        with self._lock:
+            self.bloom = bloom
+        return len(urls)
+
+    def add(self, url):
+        with self._lock:
+            if self.bloom is not None and url:
+                self.bloom.add(url)
+
+    def add_many(self, urls):
+        for url in urls:
+            self.add(url)
+
+    def _remember_confirmed(self, url):
+        self._confirmed[url] = None
+        self._confirmed.move_to_end(url)
+        while len(self._confirmed) > self.confirmed_size:
+            self._confirmed.popitem(last=False)
+
+    def filter_new(self, db: Session, urls):
+        """
+        Return the URLs from `urls` that are not stored yet, in order and
+        without repeats. Only Bloom-positive URLs cost a (single) DB query.
+        """
+        with self._lock:
+            if self.bloom is None or self.bloom.saturated:
+                self.load(db)
+
+            fresh, positives = [], []
+            for url in dict.fromkeys(u for u in urls if u):
+                self.stats['checked'] += 1
+                if url in self._confirmed:
+                    self._confirmed.move_to_end(url)
+                    self.stats['memory_hits'] += 1
+                elif url not in self.bloom:
+                    self.stats['bloom_negative'] += 1
+                    fresh.append(url)
+                else:
+                    positives.append(url)
+
+            if positives:
+                query = text(
+                    f"SELECT {self.column} FROM {self.table} WHERE {self.column} IN :urls"
+                ).bindparams(bindparam('urls', expanding=True))
+                stored = {row[0] for row in db.execute(query, {'urls': positives})}
+                for url in positives:
+                    if url in stored:
+                        self.stats['db_confirmed'] += 1
+                        self._remember_confirmed(url)
+                    else:
+                        self.stats['false_positives'] += 1
+                        fresh.append(url)
+
+            # Preserve the caller's ordering
+            keep = set(fresh)
+            return [url for url in dict.fromkeys(urls) if url in keep]
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+def get_seen_index(table):
+    """Return the process-wide index for `table`, creating it on first use."""
+    with _indexes_lock:
+        if table not in _indexes:
+            _indexes[table] = SeenUrlIndex(table)
+        return _indexes[table]
+
+def warm_seen_indexes(db: Session, tables=SEEN_URL_TABLES):
+    """Load the Bloom filters at startup; tables that don't exist are skipped."""
+    loaded = {}
+    for table in tables:
+        try:
+            loaded[table] = get_seen_index(table).load(db)
+        except Exception as e:
+            db.rollback()
+            print(f"Seen-URL index for {table} not loaded: {e}")
+    return loaded